@@ -0,0 +1,177 @@
+"""Load-balanced routing across a pool of Azure OpenAI endpoints.
+
+Council calls are spread over AZURE_TARGETS (endpoint/deployment pairs,
+possibly in several regions) so the quota of every region is used:
+
+    least_outstanding     pick the target with the fewest in-flight calls
+                          per unit of weight, breaking ties on latency
+    weighted_round_robin  smooth weighted round-robin
+
+A target leaves the rotation while its circuit breaker is open (errors)
+or, for AZURE_EJECT_SECONDS, when its recent latency is
+AZURE_EJECT_LATENCY_FACTOR times the fastest target's.
+"""
+
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from .config import (
+    AZURE_TARGETS,
+    AZURE_DEPLOYMENTS,
+    AZURE_DEPLOYMENT_DEFAULT,
+    AZURE_ROUTING_STRATEGY,
+    AZURE_EJECT_LATENCY_FACTOR,
+    AZURE_EJECT_SECONDS,
+    RATE_LIMITS,
+)
+
+# Weight of the newest sample in a target's latency average
+LATENCY_EWMA_ALPHA = 0.3
+# Samples needed before a target's latency is trusted for ejection
+EJECT_MIN_SAMPLES = 5
+
+
+class AzureTarget:
+    """One endpoint in the pool, with its live load and latency."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.name = spec["name"]
+        self.endpoint = spec.get("endpoint")
+        self.api_key = spec.get("api_key")
+        self.api_version = spec.get("api_version")
+        self.weight = max(float(spec.get("weight", 1)), 0.01)
+        self.default_deployment = spec.get("deployment")
+        self.deployments = spec.get("deployments", {})
+        azure_limits = RATE_LIMITS.get("azure", {})
+        self.limits = {
+            "rpm": int(spec.get("rpm", azure_limits.get("rpm", 0))),
+            "tpm": int(spec.get("tpm", azure_limits.get("tpm", 0))),
+        }
+
+        self.outstanding = 0
+        self.calls = 0
+        self.latency_ewma: Optional[float] = None
+        self.samples = 0
+        self.ejected_until = 0.0
+        self.current_weight = 0.0
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return get_circuit_breaker("azure", self.name)
+
+    def deployment_for(self, role: str) -> str:
+        """Deployment serving `role` on this endpoint."""
+        return (
+            self.deployments.get(role)
+            or AZURE_DEPLOYMENTS.get(role)
+            or self.default_deployment
+            or AZURE_DEPLOYMENT_DEFAULT
+        )
+
+    def ejected(self) -> bool:
+        if self.ejected_until and time.monotonic() >= self.ejected_until:
+            # Back in rotation; its old latency no longer says much
+            print(f"[Router] {self.name} returned to rotation")
+            self.ejected_until = 0.0
+            self.latency_ewma = None
+            self.samples = 0
+        return self.ejected_until > 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "weight": self.weight,
+            "outstanding": self.outstanding,
+            "calls": self.calls,
+            "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "ejected_for": round(max(self.ejected_until - time.monotonic(), 0.0), 2),
+            "circuit": self.breaker.snapshot()["state"],
+        }
+
+
+class AzureRouter:
+    """Chooses a target for each call and tracks how the targets are doing."""
+
+    def __init__(self, specs: List[Dict[str, Any]], strategy: str):
+        self.targets = [AzureTarget(spec) for spec in specs]
+        self.strategy = strategy
+
+    def _candidates(self) -> List[AzureTarget]:
+        reachable = [t for t in self.targets if t.breaker.available()]
+        healthy = [t for t in reachable if not t.ejected()]
+        # With every reachable target ejected for latency, slow beats nothing
+        return healthy or reachable
+
+    def _pick_weighted_round_robin(self, candidates: List[AzureTarget]) -> AzureTarget:
+        total = sum(t.weight for t in candidates)
+        for target in candidates:
+            target.current_weight += target.weight
+        chosen = max(candidates, key=lambda t: t.current_weight)
+        chosen.current_weight -= total
+        return chosen
+
+    def _pick_least_outstanding(self, candidates: List[AzureTarget]) -> AzureTarget:
+        return min(
+            candidates,
+            key=lambda t: (t.outstanding / t.weight, t.latency_ewma if t.latency_ewma is not None else 0.0),
+        )
+
+    def acquire(self, role: str) -> Tuple[AzureTarget, str]:
+        """
+        Choose a target for one call and count it as outstanding.
+
+        Args:
+            role: Council member ID, used to pick the deployment
+
+        Returns:
+            (target, deployment); release() must be called when the call ends
+        """
+        candidates = self._candidates()
+        if not candidates:
+            raise CircuitOpenError("Circuit open for every Azure target")
+
+        if self.strategy == "weighted_round_robin":
+            target = self._pick_weighted_round_robin(candidates)
+        else:
+            target = self._pick_least_outstanding(candidates)
+        target.outstanding += 1
+        target.calls += 1
+        return target, target.deployment_for(role)
+
+    def release(self, target: AzureTarget, latency: Optional[float] = None):
+        """End a call on `target`; pass the latency of a successful call."""
+        target.outstanding -= 1
+        if latency is None:
+            return
+        if target.latency_ewma is None:
+            target.latency_ewma = latency
+        else:
+            target.latency_ewma += LATENCY_EWMA_ALPHA * (latency - target.latency_ewma)
+        target.samples += 1
+        self._maybe_eject(target)
+
+    def _maybe_eject(self, target: AzureTarget):
+        if target.samples < EJECT_MIN_SAMPLES or target.ejected_until:
+            return
+        others = [
+            t for t in self.targets
+            if t is not target and not t.ejected_until and t.breaker.available()
+            and t.samples >= EJECT_MIN_SAMPLES
+        ]
+        if not others:
+            return
+        fastest = min(t.latency_ewma for t in others)
+        if target.latency_ewma > AZURE_EJECT_LATENCY_FACTOR * fastest:
+            print(
+                f"[Router] Ejecting {target.name} for {AZURE_EJECT_SECONDS:.0f}s "
+                f"({target.latency_ewma:.2f}s vs {fastest:.2f}s)"
+            )
+            target.ejected_until = time.monotonic() + AZURE_EJECT_SECONDS
+
+
+router = AzureRouter(AZURE_TARGETS, AZURE_ROUTING_STRATEGY)
+
+
+def get_router_stats() -> Dict[str, Dict[str, Any]]:
+    """Load, latency and rotation state for every Azure target."""
+    return {target.name: target.snapshot() for target in router.targets}
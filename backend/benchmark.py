@@ -0,0 +1,153 @@
+"""Offline latency benchmark for the council pipeline.
+
+Replaces the litellm completion calls with fakes that sleep for a fixed,
+per-member latency, then times run_full_council. With a truly async
+LLMService each stage should take about as long as its slowest member;
+the blocking mode reproduces the old behaviour, where stages take the
+sum of all members.
+
+The response cache is bypassed unless --cached is given, in which case
+every run after the first should be answered from cache.
+
+Usage:
+    python -m backend.benchmark
+    python -m backend.benchmark --mode blocking --runs 3
+    python -m backend.benchmark --cached
+    python -m backend.benchmark --tier fast
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+import litellm
+
+from .config import COUNCIL_ROLES, CHAIRMAN_SYSTEM_PROMPT, COUNCIL_TIERS
+from .council import run_full_council, tier_extra_rankers
+
+# Simulated latency (seconds) for each council member and the chairman
+DEFAULT_LATENCIES = {
+    "academic": 1.0,
+    "clinical_mentor": 1.5,
+    "student_advocate": 2.0,
+    "chairman": 2.5,
+}
+
+FAKE_RANKING = """Response A is thorough.
+Response B is practical.
+Response C is accessible.
+
+FINAL RANKING:
+1. Response A
+2. Response B
+3. Response C"""
+
+
+def _member_for_messages(messages: List[Dict[str, str]]) -> str:
+    """Work out which council member a request belongs to from its system prompt."""
+    system_prompt = messages[0]["content"] if messages else ""
+    if system_prompt == CHAIRMAN_SYSTEM_PROMPT:
+        return "chairman"
+    for member_id, role_prompt in COUNCIL_ROLES.items():
+        if role_prompt in system_prompt:
+            return member_id
+    return "chairman"
+
+
+def _fake_ranking_json(prompt: str) -> str:
+    """JSON-mode ranking of the responses in a stage 2 prompt, in the order given."""
+    labels = re.findall(r"^(Response [A-Z]+):", prompt, re.MULTILINE)
+    return json.dumps({
+        "evaluations": [{"label": label, "score": 7, "comment": "Clear and accurate."} for label in labels],
+        "ranking": labels,
+    })
+
+
+def _fake_response(member_id: str, messages: List[Dict[str, str]], response_format=None) -> SimpleNamespace:
+    """Build an object shaped like a litellm ModelResponse."""
+    prompt = messages[-1]["content"]
+    if response_format and re.search(r"^Response [A-Z]+:", prompt, re.MULTILINE):
+        content = _fake_ranking_json(prompt)
+    elif "FINAL RANKING:" in prompt:
+        content = FAKE_RANKING
+    else:
+        content = f"Feedback from {member_id}."
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def install_fake_completions(latencies: Dict[str, float]) -> None:
+    """Patch litellm with fakes that sleep for the member's latency."""
+
+    def completion(**kwargs):
+        member_id = _member_for_messages(kwargs["messages"])
+        time.sleep(latencies[member_id])
+        return _fake_response(member_id, kwargs["messages"], kwargs.get("response_format"))
+
+    async def acompletion(**kwargs):
+        member_id = _member_for_messages(kwargs["messages"])
+        await asyncio.sleep(latencies[member_id])
+        return _fake_response(member_id, kwargs["messages"], kwargs.get("response_format"))
+
+    litellm.completion = completion
+    litellm.acompletion = acompletion
+
+
+def install_blocking_path() -> None:
+    """Route the async path through the blocking litellm.completion (pre-async behaviour)."""
+    from .llm import LLMService
+
+    async def agenerate_response(messages, provider, model, api_key, temperature=0.7, timeout=None, **kwargs):
+        return LLMService.generate_response(messages, provider, model, api_key, temperature, timeout, **kwargs)
+
+    LLMService.agenerate_response = staticmethod(agenerate_response)
+
+
+async def run_benchmark(runs: int, cached: bool = False, tier: str = "standard") -> List[float]:
+    """Time run_full_council `runs` times and return the wall-clock durations."""
+    llm_config = {"provider": "azure", "model": "gpt-4o", "api_key": "", "cache_bypass": not cached}
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await run_full_council("How should we teach sepsis recognition?", llm_config=llm_config, tier=tier)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark council wall-clock time with simulated latencies.")
+    parser.add_argument("--runs", type=int, default=3, help="Number of council runs to time")
+    parser.add_argument("--mode", choices=["async", "blocking"], default="async",
+                        help="'async' uses LLMService.agenerate_response; 'blocking' simulates the old sync path")
+    parser.add_argument("--cached", action="store_true", help="Let repeat runs hit the response cache")
+    parser.add_argument("--tier", choices=COUNCIL_TIERS, default="standard", help="Latency tier to run")
+    args = parser.parse_args()
+
+    latencies = dict(DEFAULT_LATENCIES)
+    install_fake_completions(latencies)
+    if args.mode == "blocking":
+        install_blocking_path()
+
+    members = [latencies[m] for m in COUNCIL_ROLES]
+    rankers = [] if args.tier == "fast" else members + [
+        latencies.get(m, latencies["chairman"]) for m in tier_extra_rankers(args.tier)
+    ]
+    serial = sum(members) + sum(rankers) + latencies["chairman"]
+    concurrent = max(members) + max(rankers, default=0.0) + latencies["chairman"]
+
+    durations = asyncio.run(run_benchmark(args.runs, args.cached, args.tier))
+
+    print(f"Mode: {args.mode}, tier: {args.tier}")
+    print(f"Expected if serial (sum of members):        {serial:.2f}s")
+    print(f"Expected if concurrent (slowest member):    {concurrent:.2f}s")
+    for i, duration in enumerate(durations, start=1):
+        print(f"Run {i}: {duration:.2f}s")
+    print(f"Mean: {sum(durations) / len(durations):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Per-deployment circuit breakers for LLM calls.
+
+When a provider degrades, every council run would otherwise fire 7+ calls
+that each wait for a failure. Each provider/deployment gets a breaker fed
+by a rolling window of call outcomes and latencies:
+
+    closed     calls flow normally; the window is watched
+    open       the error (or slow-call) rate crossed its threshold; calls
+               fail immediately with CircuitOpenError
+    half_open  after CIRCUIT_OPEN_SECONDS one probe call is let through;
+               success closes the circuit, failure re-opens it
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Tuple
+
+from .config import (
+    CIRCUIT_WINDOW_SECONDS,
+    CIRCUIT_MIN_CALLS,
+    CIRCUIT_ERROR_RATE_THRESHOLD,
+    CIRCUIT_SLOW_CALL_SECONDS,
+    CIRCUIT_SLOW_CALL_RATE_THRESHOLD,
+    CIRCUIT_OPEN_SECONDS,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a rolling time window."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        # (timestamp, succeeded, latency seconds)
+        self._window: Deque[Tuple[float, bool, float]] = deque()
+
+    def _trim(self):
+        cutoff = time.monotonic() - CIRCUIT_WINDOW_SECONDS
+        while self._window and self._window[0][0] < cutoff:
+            self._window.popleft()
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now. In half-open state only one probe is allowed."""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < CIRCUIT_OPEN_SECONDS:
+                return False
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+
+        if self.state == HALF_OPEN:
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+        return True
+
+    def available(self) -> bool:
+        """Whether allow() would let a call through now, without claiming the probe."""
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at >= CIRCUIT_OPEN_SECONDS
+        if self.state == HALF_OPEN:
+            return not self.probe_in_flight
+        return True
+
+    def record(self, succeeded: bool, latency: float):
+        """Record a call outcome and move between states if needed."""
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+            if succeeded and latency < CIRCUIT_SLOW_CALL_SECONDS:
+                print(f"[Circuit] {self.name} closed after successful probe")
+                self.state = CLOSED
+                self._window.clear()
+            else:
+                self._open()
+            return
+
+        self._window.append((time.monotonic(), succeeded, latency))
+        self._trim()
+        if self.state == CLOSED and self._should_open():
+            self._open()
+
+    def release(self):
+        """End a call whose outcome says nothing about provider health (e.g. a bad API key)."""
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+
+    def _should_open(self) -> bool:
+        calls = len(self._window)
+        if calls < CIRCUIT_MIN_CALLS:
+            return False
+        errors = sum(1 for _, ok, _ in self._window if not ok)
+        slow = sum(1 for _, _, latency in self._window if latency >= CIRCUIT_SLOW_CALL_SECONDS)
+        return (errors / calls >= CIRCUIT_ERROR_RATE_THRESHOLD
+                or slow / calls >= CIRCUIT_SLOW_CALL_RATE_THRESHOLD)
+
+    def _open(self):
+        print(f"[Circuit] {self.name} opened")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+    def _percentile(self, latencies, pct: float) -> Optional[float]:
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(round(pct / 100.0 * (len(latencies) - 1))))
+        return round(latencies[index], 3)
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._trim()
+        calls = len(self._window)
+        errors = sum(1 for _, ok, _ in self._window if not ok)
+        latencies = sorted(latency for _, ok, latency in self._window if ok)
+        # Report the state a caller would see right now
+        state = self.state
+        if state == OPEN and time.monotonic() - self.opened_at >= CIRCUIT_OPEN_SECONDS:
+            state = HALF_OPEN
+        return {
+            "state": state,
+            "calls": calls,
+            "error_rate": round(errors / calls, 3) if calls else 0.0,
+            "latency_p50": self._percentile(latencies, 50),
+            "latency_p95": self._percentile(latencies, 95),
+            "latency_p99": self._percentile(latencies, 99),
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(provider: str, model: str) -> CircuitBreaker:
+    """Get the breaker for a provider deployment, creating it on first use."""
+    name = f"{provider}/{model}"
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(name)
+        _breakers[name] = breaker
+    return breaker
+
+
+def get_circuit_states() -> Dict[str, Dict[str, Any]]:
+    """Breaker state and recent latency percentiles for every deployment seen so far."""
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
@@ -4,6 +4,7 @@ Adapted from karpathy/llm-council for UK Nursing Education.
 Supports both OpenRouter and Azure OpenAI backends.
 """
 
+import json
 import os
 from dotenv import load_dotenv
 
@@ -12,9 +13,13 @@ load_dotenv()
 # ============================================================
 # BACKEND SELECTION
 # ============================================================
-# Set to "azure" to use Azure OpenAI, or "openrouter" for OpenRouter
+# Set to "azure" to use Azure OpenAI, or "openrouter" for OpenRouter.
+# "mock" serves every call from the offline mock provider (load testing).
 API_BACKEND = os.getenv("API_BACKEND", "azure").lower()
 
+# Provider used when a request does not send an X-Provider header
+DEFAULT_PROVIDER = "mock" if API_BACKEND == "mock" else "azure"
+
 # ============================================================
 # AZURE OPENAI CONFIGURATION
 # ============================================================
@@ -33,14 +38,104 @@ print(f"Azure API Version: {AZURE_OPENAI_API_VERSION}")
 print("=" * 60)
 
 # Azure deployment names (you create these in Azure Portal)
-# Using single deployment for all council members
+# Using single deployment for all council members. Calls without a role
+# entry (custom roles, titles, digests) go to AZURE_DEPLOYMENT_DEFAULT.
+AZURE_DEPLOYMENT_DEFAULT = os.getenv("AZURE_DEPLOYMENT_DEFAULT", "nursing-council")
 AZURE_DEPLOYMENTS = {
-    "academic": os.getenv("AZURE_DEPLOYMENT_ACADEMIC", "nursing-council"),
-    "clinical_mentor": os.getenv("AZURE_DEPLOYMENT_CLINICAL", "nursing-council"),
-    "student_advocate": os.getenv("AZURE_DEPLOYMENT_STUDENT", "nursing-council"),
-    "chairman": os.getenv("AZURE_DEPLOYMENT_CHAIRMAN", "nursing-council"),
+    "academic": os.getenv("AZURE_DEPLOYMENT_ACADEMIC", AZURE_DEPLOYMENT_DEFAULT),
+    "clinical_mentor": os.getenv("AZURE_DEPLOYMENT_CLINICAL", AZURE_DEPLOYMENT_DEFAULT),
+    "student_advocate": os.getenv("AZURE_DEPLOYMENT_STUDENT", AZURE_DEPLOYMENT_DEFAULT),
+    "chairman": os.getenv("AZURE_DEPLOYMENT_CHAIRMAN", AZURE_DEPLOYMENT_DEFAULT),
 }
 
+# Pool of Azure endpoints (possibly in several regions) that council calls
+# are spread across. JSON list; each target takes "name", "endpoint",
+# "api_key_env" (or "api_key"), and optionally "api_version", "weight",
+# "rpm", "tpm", "deployment" (for calls without a role) and "deployments"
+# (per-role overrides of AZURE_DEPLOYMENTS). Unset = the single endpoint above.
+def _load_azure_targets():
+    raw = os.getenv("AZURE_TARGETS")
+    if not raw:
+        return [{
+            "name": "default",
+            "endpoint": AZURE_OPENAI_ENDPOINT,
+            "api_key": AZURE_OPENAI_API_KEY,
+            "api_version": AZURE_OPENAI_API_VERSION,
+        }]
+    try:
+        targets = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"AZURE_TARGETS is not valid JSON: {e}")
+    for target in targets:
+        if "api_key_env" in target:
+            target["api_key"] = os.getenv(target["api_key_env"])
+        target.setdefault("api_version", AZURE_OPENAI_API_VERSION)
+    print(f"Azure targets: {', '.join(t['name'] for t in targets)}")
+    return targets
+
+
+AZURE_TARGETS = _load_azure_targets()
+# "least_outstanding" (fewest in-flight calls per unit of weight) or "weighted_round_robin"
+AZURE_ROUTING_STRATEGY = os.getenv("AZURE_ROUTING_STRATEGY", "least_outstanding").lower()
+# Take a target out of rotation for AZURE_EJECT_SECONDS when its recent
+# latency is this many times the fastest target's
+AZURE_EJECT_LATENCY_FACTOR = float(os.getenv("AZURE_EJECT_LATENCY_FACTOR", "3.0"))
+AZURE_EJECT_SECONDS = float(os.getenv("AZURE_EJECT_SECONDS", "60"))
+
+# Deployment quota (requests and tokens per minute, 0 = unlimited).
+# Calls queue locally instead of being rejected with 429s.
+RATE_LIMITS = {
+    "azure": {
+        "rpm": int(os.getenv("AZURE_RATE_LIMIT_RPM", "0")),
+        "tpm": int(os.getenv("AZURE_RATE_LIMIT_TPM", "0")),
+    },
+    # Lets load tests model a deployment quota against the mock provider
+    "mock": {
+        "rpm": int(os.getenv("MOCK_LLM_RATE_LIMIT_RPM", "0")),
+        "tpm": int(os.getenv("MOCK_LLM_RATE_LIMIT_TPM", "0")),
+    },
+}
+# Completion size assumed when charging a call against the token budget
+RATE_LIMIT_DEFAULT_COMPLETION_TOKENS = int(os.getenv("RATE_LIMIT_DEFAULT_COMPLETION_TOKENS", "1000"))
+# How many times a call that still gets a 429 is re-queued before giving up
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5"))
+
+# Retries for transient provider errors (exponential backoff with full jitter)
+LLM_RETRY_MAX_ATTEMPTS = int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "3"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+
+# Request hedging: fire a duplicate call when a member runs past its recent
+# latency percentile, keep whichever answers first
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+# Number of recent call latencies kept per member for percentiles
+LATENCY_WINDOW_SIZE = int(os.getenv("LATENCY_WINDOW_SIZE", "200"))
+
+# Circuit breaker per provider deployment: open when the error rate or the
+# share of slow calls in the rolling window crosses its threshold, fail
+# fast while open, then let one probe call through
+CIRCUIT_WINDOW_SECONDS = float(os.getenv("CIRCUIT_WINDOW_SECONDS", "60"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "10"))
+CIRCUIT_ERROR_RATE_THRESHOLD = float(os.getenv("CIRCUIT_ERROR_RATE_THRESHOLD", "0.5"))
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "60"))
+CIRCUIT_SLOW_CALL_RATE_THRESHOLD = float(os.getenv("CIRCUIT_SLOW_CALL_RATE_THRESHOLD", "0.8"))
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+
+# ============================================================
+# MOCK PROVIDER (offline benchmarking and load testing)
+# ============================================================
+# Latency distribution: fixed, normal, lognormal (long-tailed) or pareto (heavy-tailed)
+MOCK_LLM_LATENCY_DIST = os.getenv("MOCK_LLM_LATENCY_DIST", "lognormal").lower()
+MOCK_LLM_LATENCY_MEAN = float(os.getenv("MOCK_LLM_LATENCY_MEAN", "1.0"))
+MOCK_LLM_LATENCY_STDDEV = float(os.getenv("MOCK_LLM_LATENCY_STDDEV", "0.5"))
+# Fraction of calls that fail with a server error / a 429
+MOCK_LLM_ERROR_RATE = float(os.getenv("MOCK_LLM_ERROR_RATE", "0"))
+MOCK_LLM_RATE_LIMIT_RATE = float(os.getenv("MOCK_LLM_RATE_LIMIT_RATE", "0"))
+MOCK_LLM_SEED = int(os.getenv("MOCK_LLM_SEED", "42"))
+
 # ============================================================
 # OPENROUTER CONFIGURATION (fallback/alternative)
 # ============================================================
@@ -55,6 +150,45 @@ OPENROUTER_COUNCIL_MODELS = [
 ]
 OPENROUTER_CHAIRMAN_MODEL = "google/gemini-2.5-pro-preview"
 
+# ============================================================
+# CROSS-BACKEND FAILOVER (Azure -> OpenRouter)
+# ============================================================
+# On by default when an OpenRouter key is configured
+FAILOVER_ENABLED = os.getenv("FAILOVER_ENABLED", "true" if OPENROUTER_API_KEY else "false").lower() == "true"
+
+
+def _parse_chain(env_name, default):
+    """Read a fallback chain like "openrouter:openai/gpt-4o,openrouter:anthropic/claude-sonnet-4"."""
+    raw = os.getenv(env_name)
+    if not raw:
+        return default
+    return [tuple(entry.strip().split(":", 1)) for entry in raw.split(",") if entry.strip()]
+
+
+# Ordered (provider, model) backends tried after Azure, per council member
+FAILOVER_CHAINS = {
+    "academic": _parse_chain("FAILOVER_CHAIN_ACADEMIC", [("openrouter", OPENROUTER_COUNCIL_MODELS[0])]),
+    "clinical_mentor": _parse_chain("FAILOVER_CHAIN_CLINICAL", [("openrouter", OPENROUTER_COUNCIL_MODELS[1])]),
+    "student_advocate": _parse_chain("FAILOVER_CHAIN_STUDENT", [("openrouter", OPENROUTER_COUNCIL_MODELS[2])]),
+    "chairman": _parse_chain("FAILOVER_CHAIN_CHAIRMAN", [("openrouter", OPENROUTER_CHAIRMAN_MODEL)]),
+}
+# Chain for custom roles and title generation
+FAILOVER_DEFAULT_CHAIN = _parse_chain("FAILOVER_CHAIN_DEFAULT", [("openrouter", OPENROUTER_COUNCIL_MODELS[0])])
+# A backend with a fallback left gets at most this long per call (time to
+# first token when streaming) before the call moves down the chain
+FAILOVER_LATENCY_BUDGET_SECONDS = float(os.getenv("FAILOVER_LATENCY_BUDGET_SECONDS", "60"))
+# Skip a backend outright while its recent error rate is above this
+FAILOVER_ERROR_BUDGET = float(os.getenv("FAILOVER_ERROR_BUDGET", "0.25"))
+
+# ============================================================
+# HTTP CONNECTION POOLING
+# ============================================================
+# Shared clients are created at startup and reused across all council calls
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
 # ============================================================
 # COUNCIL CONFIGURATION (used by both backends)
 # ============================================================
@@ -63,9 +197,147 @@ OPENROUTER_CHAIRMAN_MODEL = "google/gemini-2.5-pro-preview"
 COUNCIL_MEMBERS = ["academic", "clinical_mentor", "student_advocate"]
 CHAIRMAN_ID = "chairman"
 
+# Maximum concurrent LLM calls per stage (standard members plus custom roles)
+COUNCIL_MAX_CONCURRENCY = int(os.getenv("COUNCIL_MAX_CONCURRENCY", "8"))
+
+# End-to-end latency budget for one council run, and how it is shared
+# between stage 1 (responses), stage 2 (rankings) and stage 3 (chairman)
+COUNCIL_DEADLINE_SECONDS = float(os.getenv("COUNCIL_DEADLINE_SECONDS", "240"))
+COUNCIL_STAGE_WEIGHTS = [
+    float(w) for w in os.getenv("COUNCIL_STAGE_WEIGHTS", "0.45,0.25,0.30").split(",")
+]
+
+# Quorum: stage 1 (responses) and stage 2 (rankings) move on once
+# COUNCIL_QUORUM_STAGEn members have answered (0 = all of them), or once
+# COUNCIL_QUORUM_WAIT_STAGEn seconds have passed and a majority has (or the
+# quorum, if smaller; 0 = no soft wait). Stragglers are then cancelled
+# (COUNCIL_STRAGGLERS=cancel) or left to finish and recorded as late
+# arrivals (record); a late answer still warms the response cache.
+COUNCIL_QUORUM_STAGE1 = int(os.getenv("COUNCIL_QUORUM_STAGE1", "0"))
+COUNCIL_QUORUM_STAGE2 = int(os.getenv("COUNCIL_QUORUM_STAGE2", "0"))
+COUNCIL_QUORUM_WAIT_STAGE1 = float(os.getenv("COUNCIL_QUORUM_WAIT_STAGE1", "0"))
+COUNCIL_QUORUM_WAIT_STAGE2 = float(os.getenv("COUNCIL_QUORUM_WAIT_STAGE2", "0"))
+COUNCIL_STRAGGLERS = os.getenv("COUNCIL_STRAGGLERS", "record").lower()
+
+# Stage 2 ranking output: "json" asks each ranker for structured output
+# (ordered labels plus a short score and comment per response, capped at
+# STAGE2_JSON_BASE_TOKENS plus STAGE2_JSON_TOKENS_PER_RESPONSE for each
+# response in the prompt, and at most STAGE2_JSON_MAX_TOKENS); "text"
+# keeps the free-text critique that ends in a FINAL RANKING: block
+STAGE2_RANKING_MODE = os.getenv("STAGE2_RANKING_MODE", "json").lower()
+STAGE2_JSON_BASE_TOKENS = int(os.getenv("STAGE2_JSON_BASE_TOKENS", "100"))
+STAGE2_JSON_TOKENS_PER_RESPONSE = int(os.getenv("STAGE2_JSON_TOKENS_PER_RESPONSE", "60"))
+STAGE2_JSON_MAX_TOKENS = int(os.getenv("STAGE2_JSON_MAX_TOKENS", "1000"))
+
+# Hierarchical chairman synthesis: once the chairman prompt is estimated
+# above CHAIRMAN_MAP_REDUCE_THRESHOLD_TOKENS, groups of
+# CHAIRMAN_MAP_GROUP_SIZE responses (and rankings) are summarized in
+# parallel first and the chairman works from the summaries
+CHAIRMAN_MAP_REDUCE_THRESHOLD_TOKENS = int(os.getenv("CHAIRMAN_MAP_REDUCE_THRESHOLD_TOKENS", "24000"))
+CHAIRMAN_MAP_GROUP_SIZE = int(os.getenv("CHAIRMAN_MAP_GROUP_SIZE", "5"))
+
+# Stage 2 prompt compression: rankers see bounded digests of the stage 1
+# responses (computed once per run) instead of their full text.
+# "off", "extract" (lead sentence of each paragraph, no LLM calls) or
+# "llm" (a condensing call per long response, falling back to extract);
+# the digest size is STAGE2_DIGEST_MAX_TOKENS (see GENERATION PROFILES)
+STAGE2_DIGEST_MODE = os.getenv("STAGE2_DIGEST_MODE", "off").lower()
+
+# Ranker self-exclusion: each council member ranks only the other members'
+# responses (relabelled A, B, ... in its own prompt), which shortens the
+# prompt and removes self-preference
+STAGE2_SELF_EXCLUSION = os.getenv("STAGE2_SELF_EXCLUSION", "false").lower() == "true"
+
+# Single-judge ranking (per request): one call by this member ranks every
+# response instead of the whole council reviewing each other
+STAGE2_JUDGE_MEMBER = os.getenv("STAGE2_JUDGE_MEMBER", CHAIRMAN_ID)
+
+# Large councils: with more stage 1 responses than
+# STAGE2_MAX_RESPONSES_PER_PROMPT, each stage 2 prompt carries a sampled
+# subset of at most that many, and every response is ranked in
+# STAGE2_SAMPLE_COVERAGE subsets (spread across the rankers)
+STAGE2_MAX_RESPONSES_PER_PROMPT = int(os.getenv("STAGE2_MAX_RESPONSES_PER_PROMPT", "10"))
+STAGE2_SAMPLE_COVERAGE = int(os.getenv("STAGE2_SAMPLE_COVERAGE", "3"))
+
+# Speculative chairman: draft the synthesis from stage 1 while stage 2
+# runs, then keep the draft if the peer rankings agree with what it leaned
+# on most, or revise it against the rankings in a short second pass
+CHAIRMAN_SPECULATIVE = os.getenv("CHAIRMAN_SPECULATIVE", "false").lower() == "true"
+
+# Latency tiers, chosen per request with the X-Council-Tier header or the
+# "tier" field of the message body (see docs/LATENCY_TIERS.md):
+#   fast      stage 1 and the chairman, without peer review
+#   standard  the full three-stage council
+#   thorough  peer review with STAGE2_JUDGE_MEMBER as an extra ranker, and
+#             always a full (never speculative) chairman synthesis
+COUNCIL_TIERS = ("fast", "standard", "thorough")
+COUNCIL_DEFAULT_TIER = os.getenv("COUNCIL_DEFAULT_TIER", "standard").lower()
+
 # Data directory for conversation storage
 DATA_DIR = "data/conversations"
 
+# ============================================================
+# GENERATION PROFILES
+# ============================================================
+# Generation arguments per stage, overridable per stage with e.g.
+# STAGE1_MAX_TOKENS, STAGE1_TEMPERATURE, STAGE1_STOP (sequences separated
+# by "||") and STAGE1_SEED. A max_tokens of 0 means no cap. GENERATION_SEED
+# sets a seed for every stage (honoured by providers that support it).
+GENERATION_SEED = os.getenv("GENERATION_SEED")
+
+
+def _generation_profile(stage, max_tokens, temperature):
+    """Read one stage's generation profile from STAGE-prefixed env vars."""
+    prefix = stage.upper()
+    profile = {"temperature": float(os.getenv(f"{prefix}_TEMPERATURE", temperature))}
+    cap = int(os.getenv(f"{prefix}_MAX_TOKENS", max_tokens))
+    if cap > 0:
+        profile["max_tokens"] = cap
+    stop = os.getenv(f"{prefix}_STOP")
+    if stop:
+        profile["stop"] = stop.split("||")
+    seed = os.getenv(f"{prefix}_SEED", GENERATION_SEED)
+    if seed:
+        profile["seed"] = int(seed)
+    return profile
+
+
+GENERATION_PROFILES = {
+    "stage1": _generation_profile("stage1", 1500, 0.7),
+    "stage2": _generation_profile("stage2", 1000, 0.7),
+    "stage3": _generation_profile("stage3", 3000, 0.7),
+    # Digests of stage 1 responses for the rankers (STAGE2_DIGEST_MODE=llm);
+    # max_tokens is also the digest size in extract mode
+    "stage2_digest": _generation_profile("stage2_digest", 300, 0.2),
+    # Group summaries of hierarchical chairman synthesis
+    "stage3_map": _generation_profile("stage3_map", 600, 0.3),
+    # Only the first 50 characters of a title are kept
+    "title": _generation_profile("title", 20, 0.7),
+}
+# Per-role overrides on top of the stage profile, keyed by member ID
+# ("chairman", "custom" for custom roles), e.g.
+# {"academic": {"max_tokens": 2000}, "chairman": {"temperature": 0.3}}
+GENERATION_ROLE_PROFILES = json.loads(os.getenv("GENERATION_ROLE_PROFILES", "{}"))
+
+# ============================================================
+# LLM RESPONSE CACHE
+# ============================================================
+# In-memory LRU in front of every council call, plus an optional on-disk
+# tier under DATA_DIR. Send "X-Cache-Bypass: true" to skip it per request.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+LLM_CACHE_DISK_ENABLED = os.getenv("LLM_CACHE_DISK_ENABLED", "false").lower() == "true"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_DISK_MAX_MB = int(os.getenv("LLM_CACHE_DISK_MAX_MB", "100"))
+
+# ============================================================
+# USAGE & COST ACCOUNTING
+# ============================================================
+# USD per 1K tokens for models litellm has no price for (e.g. Azure
+# deployment names). Defaults are gpt-4o list prices.
+LLM_PRICE_PROMPT_PER_1K = float(os.getenv("LLM_PRICE_PROMPT_PER_1K", "0.0025"))
+LLM_PRICE_COMPLETION_PER_1K = float(os.getenv("LLM_PRICE_COMPLETION_PER_1K", "0.01"))
+
 # ============================================================
 # NURSING COUNCIL SYSTEM PROMPTS
 # ============================================================
@@ -122,3 +394,13 @@ When synthesizing:
 
 Always maintain a supportive, developmental tone - this is about improving educational content,
 not criticizing the educator who created it."""
+
+# System prompt for a ranker outside the council (the single judge, or the
+# thorough tier's extra ranker), so it evaluates rather than synthesizes
+JUDGE_SYSTEM_PROMPT = """You are the Head of Nursing Education, judging the responses of this council.
+
+Your role is to evaluate the labelled, anonymized responses below, whichever council members wrote them,
+and rank them on their merits: alignment with NMC standards, clinical accuracy, and how useful they are to the educator.
+
+Judge each response on its substance, not its length or style, and do not write a synthesis or an answer
+of your own. Follow the requested output format exactly."""
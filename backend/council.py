@@ -1,35 +1,145 @@
 """3-stage LLM Council orchestration."""
 
-from typing import List, Dict, Any, Tuple, Optional
-from .llm_client import query_models_parallel, query_model, query_model_with_custom_prompt, get_council_members, get_chairman
+import asyncio
+import json
+import random
+import re
+import time
+from collections import defaultdict
+from functools import partial
+from typing import List, Dict, Any, Tuple, Optional, AsyncIterator, Awaitable, Callable
+from .config import (
+    COUNCIL_MAX_CONCURRENCY,
+    COUNCIL_QUORUM_STAGE1,
+    COUNCIL_QUORUM_STAGE2,
+    COUNCIL_QUORUM_WAIT_STAGE1,
+    COUNCIL_QUORUM_WAIT_STAGE2,
+    COUNCIL_STRAGGLERS,
+    COUNCIL_DEADLINE_SECONDS,
+    COUNCIL_STAGE_WEIGHTS,
+    STAGE2_RANKING_MODE,
+    STAGE2_JSON_BASE_TOKENS,
+    STAGE2_JSON_TOKENS_PER_RESPONSE,
+    STAGE2_JSON_MAX_TOKENS,
+    GENERATION_PROFILES,
+    GENERATION_ROLE_PROFILES,
+    CHAIRMAN_SPECULATIVE,
+    STAGE2_MAX_RESPONSES_PER_PROMPT,
+    STAGE2_SAMPLE_COVERAGE,
+    CHAIRMAN_MAP_REDUCE_THRESHOLD_TOKENS,
+    CHAIRMAN_MAP_GROUP_SIZE,
+    STAGE2_DIGEST_MODE,
+    STAGE2_SELF_EXCLUSION,
+    STAGE2_JUDGE_MEMBER,
+    COUNCIL_TIERS,
+    COUNCIL_DEFAULT_TIER,
+    JUDGE_SYSTEM_PROMPT,
+)
+from .rate_limiter import estimate_tokens
+from .usage import record_call, summarize_run
+from .llm_client import iter_as_completed, query_model, query_model_stream, query_model_with_custom_prompt, get_council_members, get_chairman
+
+
+class CouncilDeadline:
+    """
+    Splits a run-level latency budget across the three council stages.
 
+    Each stage gets its weighted share of whatever time is left when it
+    starts, so time a stage does not use carries over to the later ones.
+    For example, with a 90s budget, if stage 1 finishes in 40s then
+    stages 2 and 3 share the remaining 50s.
 
-async def stage1_collect_responses(
-    user_query: str,
-    custom_roles: Optional[List[Dict[str, Any]]] = None,
-    llm_config: Optional[Dict[str, str]] = None
-) -> List[Dict[str, Any]]:
+    `weights` replaces COUNCIL_STAGE_WEIGHTS, e.g. to give a skipped stage
+    no share (see tier_stage_weights).
     """
-    Stage 1: Collect individual responses from all council models.
-    """
-    messages = [{"role": "user", "content": user_query}]
 
-    # Query standard council members in parallel
-    responses = await query_models_parallel(get_council_members(), messages, llm_config)
+    def __init__(self, total_seconds: Optional[float] = None, weights: Optional[List[float]] = None):
+        self.total_seconds = total_seconds if total_seconds is not None else COUNCIL_DEADLINE_SECONDS
+        self.weights = weights if weights is not None else COUNCIL_STAGE_WEIGHTS
+        self.expires_at = time.monotonic() + self.total_seconds
 
-    # Format results from standard members
-    stage1_results = []
-    for model, response in responses.items():
-        if response is not None:  # Only include successful responses
-            stage1_results.append({
-                "model": model,
-                "response": response.get('content', '')
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def stage_timeout(self, stage: int) -> float:
+        """Timeout for stage 1, 2 or 3, given the time left right now."""
+        weights = self.weights[stage - 1:]
+        share = weights[0] / sum(weights) if sum(weights) > 0 else 1.0
+        return self.remaining() * share
+
+
+def tier_stage_weights(tier: str) -> List[float]:
+    """Stage weights for a latency tier: the fast tier has no stage 2 to budget for."""
+    if tier == "fast":
+        return [COUNCIL_STAGE_WEIGHTS[0], 0.0, COUNCIL_STAGE_WEIGHTS[2]]
+    return COUNCIL_STAGE_WEIGHTS
+
+
+def tier_extra_rankers(tier: str) -> List[str]:
+    """Rankers a latency tier adds to the council's peer review."""
+    return [STAGE2_JUDGE_MEMBER] if tier == "thorough" else []
+
+
+_quorum_stats = {"stragglers": 0, "late_arrivals": 0}
+
+
+def _late_arrival_handler(
+    stage: str,
+    names: List[str],
+    late_arrivals: Optional[List[Dict[str, Any]]]
+) -> Optional[Callable[[int, Dict[str, Any]], None]]:
+    """on_late callback recording stragglers that answer after their stage moved on."""
+    if COUNCIL_STRAGGLERS != "record":
+        return None
+
+    def on_late(index: int, response: Dict[str, Any]):
+        record_call(stage, response.get('usage'))
+        _quorum_stats["late_arrivals"] += 1
+        print(f"[Quorum] {names[index]} answered {stage} after the council moved on")
+        if late_arrivals is not None:
+            late_arrivals.append({
+                "stage": stage,
+                "model": names[index],
+                "backend": response.get('backend'),
+                "usage": response.get('usage')
             })
 
-    # Query custom roles if provided
-    if custom_roles:
-        for custom_role in custom_roles:
-            custom_prompt = f"""You are {custom_role['name']}, a council member reviewing nursing educational content.
+    return on_late
+
+
+def _within(deadline: float, call: Callable[..., Awaitable[Any]]) -> Awaitable[Any]:
+    """
+    Run `call(timeout=...)` with whatever is left of a stage's deadline when
+    it starts. Calls queued behind COUNCIL_MAX_CONCURRENCY would otherwise
+    start their own full timeout late, and the stage would run in waves.
+    """
+    async def start():
+        return await call(timeout=max(deadline - time.monotonic(), 0))
+
+    return start()
+
+
+def _count_stragglers(stage: str, total: int, seen: int):
+    if seen < total:
+        _quorum_stats["stragglers"] += total - seen
+        print(f"[Quorum] {stage} moved on with {total - seen} of {total} members still running")
+
+
+def get_quorum_stats() -> Dict[str, int]:
+    """Members left behind by a quorum, and how many of them answered later."""
+    return dict(_quorum_stats)
+
+
+def generation_params(stage: str, member_id: str) -> Dict[str, Any]:
+    """Generation arguments for one call: the stage's profile plus the role's overrides."""
+    params = dict(GENERATION_PROFILES[stage])
+    params.update(GENERATION_ROLE_PROFILES.get(member_id, {}))
+    return params
+
+
+def build_custom_role_prompt(custom_role: Dict[str, Any]) -> str:
+    """Build the system prompt for a user-defined council role."""
+    return f"""You are {custom_role['name']}, a council member reviewing nursing educational content.
 
 Your focus area: {custom_role['description']}
 
@@ -40,17 +150,82 @@ Be specific about:
 - What could be improved
 - Concrete suggestions for enhancement"""
 
-            response = await query_model_with_custom_prompt(
-                messages=messages,
-                system_prompt=custom_prompt,
-                llm_config=llm_config
-            )
-            if response:
-                stage1_results.append({
-                    "model": custom_role['name'],
-                    "response": response.get('content', ''),
-                    "isCustom": True
-                })
+
+async def stage1_iter_responses(
+    user_query: str,
+    custom_roles: Optional[List[Dict[str, Any]]] = None,
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+    late_arrivals: Optional[List[Dict[str, Any]]] = None
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stage 1 as an as-completed iterator.
+
+    Standard members and custom roles run in one concurrent batch, bounded
+    by COUNCIL_MAX_CONCURRENCY. Yields (index, result) for each successful
+    member as soon as it answers. The index is the member's position in the
+    council (standard members first, then custom roles), so callers can
+    restore a deterministic order. Failed members, and members that have
+    not answered `timeout` seconds after the stage started (time spent
+    queued for a concurrency slot included), are skipped.
+
+    The stage ends early once its quorum is met (COUNCIL_QUORUM_STAGE1 /
+    COUNCIL_QUORUM_WAIT_STAGE1). Stragglers that answer later are appended
+    to `late_arrivals` if given.
+    """
+    messages = [{"role": "user", "content": user_query}]
+    deadline = time.monotonic() + timeout
+
+    names = []
+    tasks = []
+    for member_id in get_council_members():
+        names.append((member_id, False))
+        tasks.append(_within(deadline, partial(
+            query_model, member_id, messages, llm_config, params=generation_params("stage1", member_id)
+        )))
+
+    for custom_role in custom_roles or []:
+        names.append((custom_role['name'], True))
+        tasks.append(_within(deadline, partial(
+            query_model_with_custom_prompt,
+            messages=messages,
+            system_prompt=build_custom_role_prompt(custom_role),
+            llm_config=llm_config,
+            params=generation_params("stage1", "custom")
+        )))
+
+    on_late = _late_arrival_handler("stage1", [name for name, _ in names], late_arrivals)
+    seen = 0
+    async for index, response in iter_as_completed(
+        tasks, COUNCIL_MAX_CONCURRENCY, COUNCIL_QUORUM_STAGE1, COUNCIL_QUORUM_WAIT_STAGE1, on_late
+    ):
+        seen += 1
+        if response is None:  # Only include successful responses
+            continue
+        model, is_custom = names[index]
+        record_call("stage1", response.get('usage'))
+        result = {
+            "model": model,
+            "response": response.get('content', ''),
+            "backend": response.get('backend'),
+            "usage": response.get('usage')
+        }
+        if is_custom:
+            result["isCustom"] = True
+        yield index, result
+    _count_stragglers("stage1", len(tasks), seen)
+
+
+def order_stage1_results(
+    results_by_index: Dict[int, Dict[str, Any]],
+    llm_config: Optional[Dict[str, str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Put streamed stage 1 results back into council order.
+
+    Raises if no member answered.
+    """
+    stage1_results = [results_by_index[i] for i in sorted(results_by_index)]
 
     if not stage1_results:
         # If BYOK failed, provide specific error
@@ -61,16 +236,130 @@ Be specific about:
     return stage1_results
 
 
-async def stage2_collect_rankings(
+async def stage1_collect_responses(
+    user_query: str,
+    custom_roles: Optional[List[Dict[str, Any]]] = None,
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+    late_arrivals: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Stage 1: Collect individual responses from all council models.
+    """
+    results_by_index = {}
+    async for index, result in stage1_iter_responses(user_query, custom_roles, llm_config, timeout, late_arrivals):
+        results_by_index[index] = result
+
+    return order_stage1_results(results_by_index, llm_config)
+
+
+# Structured stage 2 output: a short score and comment per response plus
+# the labels ordered best to worst
+RANKING_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "evaluations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "label": {"type": "string"},
+                    "score": {"type": "integer"},
+                    "comment": {"type": "string"},
+                },
+                "required": ["label", "score", "comment"],
+                "additionalProperties": False,
+            },
+        },
+        "ranking": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["evaluations", "ranking"],
+    "additionalProperties": False,
+}
+
+RANKING_JSON_INSTRUCTIONS = """Your task:
+1. Score each response from 1 (poor) to 10 (excellent) with a one-sentence comment (at most 25 words).
+2. Rank the responses from best to worst.
+
+Reply with JSON only, in exactly this shape:
+{"evaluations": [{"label": "Response A", "score": 7, "comment": "..."}, ...],
+ "ranking": ["Response C", "Response A", "Response B"]}
+
+Use the labels exactly as given ("Response A", "Response B", ...) and include every response in the ranking."""
+
+RANKING_TEXT_INSTRUCTIONS = """Your task:
+1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
+2. Then, at the very end of your response, provide a final ranking.
+
+IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
+- Start with the line "FINAL RANKING:" (all caps, with colon)
+- Then list the responses from best to worst as a numbered list
+- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
+- Do not add any other text or explanations in the ranking section
+
+Example of the correct format for your ENTIRE response:
+
+Response A provides good detail on X but misses Y...
+Response B is accurate but lacks depth on Z...
+Response C offers the most comprehensive answer...
+
+FINAL RANKING:
+1. Response C
+2. Response A
+3. Response B
+
+Now provide your evaluation and ranking:"""
+
+
+def ranking_params(member_id: str, mode: str = STAGE2_RANKING_MODE, responses: int = 0) -> Dict[str, Any]:
+    """
+    Generation arguments for a ranker's stage 2 call in the given mode.
+
+    In "json" mode the output cap grows with the number of `responses` in
+    the prompt, so a long evaluation list is not cut off mid-JSON.
+    """
+    params = generation_params("stage2", member_id)
+    if mode == "json":
+        cap = min(STAGE2_JSON_BASE_TOKENS + STAGE2_JSON_TOKENS_PER_RESPONSE * responses, STAGE2_JSON_MAX_TOKENS)
+        params["max_tokens"] = min(params.get("max_tokens", cap), cap)
+        params["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": "council_ranking", "schema": RANKING_JSON_SCHEMA, "strict": True},
+        }
+    return params
+
+
+def response_label(index: int) -> str:
+    """Anonymous label for the index-th response: A..Z, then AA, AB, ..."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def build_ranking_prompt(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
-    llm_config: Optional[Dict[str, str]] = None
-) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    mode: str = STAGE2_RANKING_MODE,
+    indices: Optional[List[int]] = None
+) -> Tuple[str, Dict[str, str]]:
     """
-    Stage 2: Each model ranks the anonymized responses.
+    Build the anonymized stage 2 ranking prompt.
+
+    Args:
+        user_query: The original question
+        stage1_results: Stage 1 results to rank
+        mode: "json" for structured scores and ranking, "text" for free-text critiques
+        indices: Optional subset of stage1_results to include (labels stay
+            those of the full list)
+
+    Returns:
+        Tuple of (ranking prompt, label_to_model mapping for the full list)
     """
-    # Create anonymized labels for responses (Response A, Response B, etc.)
-    labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
+    # Create anonymized labels for responses (Response A, ..., Response Z, Response AA, ...)
+    labels = [response_label(i) for i in range(len(stage1_results))]
 
     # Create mapping from label to model name
     label_to_model = {
@@ -79,9 +368,11 @@ async def stage2_collect_rankings(
     }
 
     # Build the ranking prompt
+    if indices is None:
+        indices = list(range(len(stage1_results)))
     responses_text = "\n\n".join([
-        f"Response {label}:\n{result['response']}"
-        for label, result in zip(labels, stage1_results)
+        f"Response {labels[i]}:\n{stage1_results[i]['response']}"
+        for i in indices
     ])
 
     ranking_prompt = f"""You are evaluating different responses to the following question:
@@ -92,57 +383,423 @@ Here are the responses from different models (anonymized):
 
 {responses_text}
 
-Your task:
-1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
-2. Then, at the very end of your response, provide a final ranking.
+{RANKING_JSON_INSTRUCTIONS if mode == "json" else RANKING_TEXT_INSTRUCTIONS}"""
 
-IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
-- Start with the line "FINAL RANKING:" (all caps, with colon)
-- Then list the responses from best to worst as a numbered list
-- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
-- Do not add any other text or explanations in the ranking section
+    return ranking_prompt, label_to_model
 
-Example of the correct format for your ENTIRE response:
 
-Response A provides good detail on X but misses Y...
-Response B is accurate but lacks depth on Z...
-Response C offers the most comprehensive answer...
+def extract_digest(text: str, max_tokens: int) -> str:
+    """
+    Extractive digest of about `max_tokens` tokens.
 
-FINAL RANKING:
-1. Response C
-2. Response A
-3. Response B
+    Takes the first sentence of every paragraph (headings and list items
+    count as paragraphs), then the second, and so on while they fit, so
+    every point keeps its lead and the original order is preserved.
+    """
+    budget = max_tokens * 4  # ~4 characters per token, as in estimate_tokens
+    if len(text) <= budget:
+        return text
+    paragraphs = [
+        re.split(r'(?<=[.!?])\s+', paragraph.strip())
+        for paragraph in re.split(r'\n\s*\n|\n(?=\s*(?:[-*#]|\d+\.))', text)
+        if paragraph.strip()
+    ]
+    kept = [0] * len(paragraphs)
+    used = 0
+    for depth in range(max(len(sentences) for sentences in paragraphs)):
+        for p, sentences in enumerate(paragraphs):
+            if depth < len(sentences) and kept[p] == depth and used + len(sentences[depth]) + 1 <= budget:
+                kept[p] += 1
+                used += len(sentences[depth]) + 1
+    digest = "\n".join(" ".join(sentences[:n]) for sentences, n in zip(paragraphs, kept) if n)
+    if not digest:
+        digest = text[:budget].rsplit(" ", 1)[0] + " ..."
+    return digest
+
+
+def _digest_prompt(user_query: str, response: str, max_tokens: int) -> str:
+    return f"""Condense the following answer to the question below into at most {max_tokens} tokens, for a reviewer who will compare it with other answers.
+
+Keep its key recommendations, claims and evidence, and keep any errors, gaps or unsafe advice as they are. Do not improve, correct or judge it, and do not add anything.
 
-Now provide your evaluation and ranking:"""
+Question: {user_query}
 
-    messages = [{"role": "user", "content": ranking_prompt}]
+Answer:
+{response}
 
-    # Get rankings from all council models in parallel
-    responses = await query_models_parallel(get_council_members(), messages, llm_config)
+Condensed answer:"""
+
+
+async def condense_responses(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 60.0,
+    mode: str = STAGE2_DIGEST_MODE
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Digest stage 1 responses once, for all stage 2 rankers.
+
+    Responses longer than the stage2_digest max_tokens are replaced by an
+    extractive digest ("extract") or an LLM-written one ("llm", falling
+    back to extractive if the call fails). The chairman still sees the
+    full responses.
+
+    Returns:
+        Tuple of (stage 1 results to rank, digest info or None when mode
+        is "off"); pass the info to digest_metadata once the rankings are
+        planned
+    """
+    if mode not in ("extract", "llm"):
+        return stage1_results, None
+
+    params = generation_params("stage2_digest", "digest")
+    max_tokens = params.get("max_tokens", 300)
+    long_indices = [
+        i for i, result in enumerate(stage1_results)
+        if estimate_tokens([{"content": result['response']}], 0) > max_tokens
+    ]
+
+    digests = {}
+    calls = []
+    if mode == "llm":
+        deadline = time.monotonic() + timeout
+        tasks = [
+            _within(deadline, partial(
+                query_model,
+                "digest", [{"role": "user", "content": _digest_prompt(user_query, stage1_results[i]['response'], max_tokens)}],
+                llm_config, params=params
+            ))
+            for i in long_indices
+        ]
+        async for index, response in iter_as_completed(tasks, COUNCIL_MAX_CONCURRENCY):
+            if response is not None and response.get('content'):
+                record_call("stage2", response.get('usage'))
+                calls.append(response.get('usage'))
+                digests[long_indices[index]] = response['content'].strip()
+    for i in long_indices:
+        if i not in digests:
+            digests[i] = extract_digest(stage1_results[i]['response'], max_tokens)
+
+    condensed = [
+        {**result, "response": digests[i]} if i in digests else result
+        for i, result in enumerate(stage1_results)
+    ]
+    saved = [
+        estimate_tokens([{"content": result['response']}], 0) - estimate_tokens([{"content": condensed[i]['response']}], 0)
+        for i, result in enumerate(stage1_results)
+    ]
+    return condensed, {"mode": mode, "max_tokens": max_tokens, "digested": len(long_indices), "calls": calls, "saved": saved}
+
+
+def digest_metadata(digest_info: Dict[str, Any], assignments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Token savings of a run's digests, for run metadata.
 
-    # Format results
-    stage2_results = []
-    for model, response in responses.items():
+    prompt_tokens_saved counts each response's saving once per ranking
+    prompt it appears in; net_tokens_saved subtracts the digest calls.
+    """
+    saved_by_label = {f"Response {response_label(i)}": saved for i, saved in enumerate(digest_info["saved"])}
+    prompt_tokens_saved = sum(
+        saved_by_label[label]
+        for assignment in assignments
+        for label in (assignment["candidates"] or saved_by_label)
+    )
+    digest_tokens = sum(call.get("total_tokens", 0) for call in digest_info["calls"])
+    return {
+        "mode": digest_info["mode"],
+        "max_tokens": digest_info["max_tokens"],
+        "digested": digest_info["digested"],
+        "digest_calls": len(digest_info["calls"]),
+        "digest_tokens": digest_tokens,
+        "prompt_tokens_saved": prompt_tokens_saved,
+        "net_tokens_saved": prompt_tokens_saved - digest_tokens,
+    }
+
+
+def _sample_subsets(user_query: str, count: int) -> List[List[int]]:
+    """
+    Split `count` responses into subsets of at most STAGE2_MAX_RESPONSES_PER_PROMPT.
+
+    Each of STAGE2_SAMPLE_COVERAGE rounds shuffles the responses and cuts
+    them into near-equal groups, so every response is ranked that many
+    times against varying competitors. The shuffle is seeded by the query,
+    so a repeated question gets the same (cacheable) prompts.
+    """
+    rng = random.Random(f"{user_query}:{count}")
+    groups = -(-count // max(STAGE2_MAX_RESPONSES_PER_PROMPT, 2))
+    subsets = []
+    for _ in range(max(STAGE2_SAMPLE_COVERAGE, 1)):
+        order = list(range(count))
+        rng.shuffle(order)
+        subsets.extend(sorted(order[g::groups]) for g in range(groups))
+    return subsets
+
+
+def plan_rankings(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    mode: str = STAGE2_RANKING_MODE,
+    self_exclusion: bool = STAGE2_SELF_EXCLUSION,
+    judge: Optional[str] = None,
+    extra_rankers: Optional[List[str]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Plan the stage 2 ranking calls.
+
+    Normally every council member ranks all responses in one prompt. With
+    more than STAGE2_MAX_RESPONSES_PER_PROMPT responses, the sampled
+    subsets from _sample_subsets are dealt round-robin to the members
+    instead, so prompt size stays bounded and the total grows linearly
+    with the number of responses.
+
+    With `self_exclusion`, a member's own response is left out of its
+    prompts and the rest are relabelled Response A, B, ... for that
+    member; 'labels' maps these back to the run's labels.
+
+    With a `judge` (member ID), that member alone ranks every response in
+    a single call. `extra_rankers` (member IDs) join the council members
+    otherwise; one that already sits on the council is not added again, as
+    its second call would repeat the first and count the same ranking twice.
+
+    Returns:
+        Tuple of (assignments, label_to_model), where each assignment is
+        {"ranker", "prompt", "candidates": run labels in the prompt, or None
+        for all, "labels": prompt label -> run label, or None if the same,
+        "responses": number of responses in the prompt, "system_prompt":
+        JUDGE_SYSTEM_PROMPT for rankers outside the council, else None}
+    """
+    members = get_council_members()
+    rankers = members + [ranker for ranker in dict.fromkeys(extra_rankers or []) if ranker not in members]
+    count = len(stage1_results)
+    run_labels = [f"Response {response_label(i)}" for i in range(count)]
+    label_to_model = {label: result['model'] for label, result in zip(run_labels, stage1_results)}
+
+    if judge:
+        plan = [(judge, list(range(count)))]
+        self_exclusion = False
+    elif count <= STAGE2_MAX_RESPONSES_PER_PROMPT:
+        plan = [(m, list(range(count))) for m in rankers]
+    else:
+        plan = [(rankers[i % len(rankers)], indices) for i, indices in enumerate(_sample_subsets(user_query, count))]
+
+    assignments = []
+    for ranker, indices in plan:
+        labels = None
+        if self_exclusion:
+            indices = [i for i in indices if stage1_results[i]['model'] != ranker]
+            if len(indices) < 2:
+                continue
+            prompt, prompt_labels = build_ranking_prompt(user_query, [stage1_results[i] for i in indices], mode)
+            labels = {label: run_labels[i] for label, i in zip(prompt_labels, indices)}
+        else:
+            prompt, _ = build_ranking_prompt(user_query, stage1_results, mode, indices)
+        assignments.append({
+            "ranker": ranker,
+            "prompt": prompt,
+            "candidates": [run_labels[i] for i in indices] if len(indices) < count else None,
+            "labels": labels,
+            "responses": len(indices),
+            "system_prompt": None if ranker in members else JUDGE_SYSTEM_PROMPT,
+        })
+    return assignments, label_to_model
+
+
+def judge_metadata(
+    judge_assignments: List[Dict[str, Any]],
+    peer_assignments: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Savings of a single-judge stage 2 over the peer review it replaced, for
+    run metadata. Prompt tokens are estimated from the ranking prompts.
+    """
+    def prompt_tokens(assignments):
+        return sum(estimate_tokens([{"role": "user", "content": a["prompt"]}], 0) for a in assignments)
+
+    judge_tokens = prompt_tokens(judge_assignments)
+    peer_tokens = prompt_tokens(peer_assignments)
+    return {
+        "judge": judge_assignments[0]["ranker"] if judge_assignments else None,
+        "calls": len(judge_assignments),
+        "peer_calls": len(peer_assignments),
+        "calls_saved": len(peer_assignments) - len(judge_assignments),
+        "prompt_tokens": judge_tokens,
+        "peer_prompt_tokens": peer_tokens,
+        "prompt_tokens_saved": peer_tokens - judge_tokens,
+    }
+
+
+def _relabel(text: str, labels: Dict[str, str]) -> str:
+    """Rewrite a ranker's own labels (Response A, ...) as the run's labels."""
+    return re.sub(r'Response [A-Z]+\b', lambda m: labels.get(m.group(0), m.group(0)), text)
+
+
+async def stage2_iter_rankings(
+    assignments: List[Dict[str, Any]],
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+    mode: str = STAGE2_RANKING_MODE,
+    late_arrivals: Optional[List[Dict[str, Any]]] = None
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stage 2 as an as-completed iterator.
+
+    Runs the calls planned by plan_rankings and yields (index, result) for
+    each successful one as soon as it answers, where index is the call's
+    position in `assignments`. Results of partial calls (sampled, or
+    without the ranker's own response) carry the 'candidates' they ranked,
+    and use the run's labels throughout. In "json" mode the
+    result also carries per-response 'scores', and 'ranking' is rendered
+    from the JSON (ending in a FINAL RANKING: block, as in text mode). A
+    ranker whose output is not valid JSON is parsed as free text if it has
+    a FINAL RANKING: block, and counts as no ranking otherwise (e.g. JSON
+    cut off mid-way, whose evaluations would read as an A, B, C order).
+
+    Like stage 1, the stage ends early once its quorum is met
+    (COUNCIL_QUORUM_STAGE2 / COUNCIL_QUORUM_WAIT_STAGE2).
+    """
+    # Get rankings from all council models in parallel
+    rankers = [assignment["ranker"] for assignment in assignments]
+    deadline = time.monotonic() + timeout
+    tasks = [
+        _within(deadline, partial(
+            query_model,
+            assignment["ranker"], [{"role": "user", "content": assignment["prompt"]}], llm_config,
+            params=ranking_params(assignment["ranker"], mode, assignment["responses"]),
+            system_prompt=assignment["system_prompt"]
+        ))
+        for assignment in assignments
+    ]
+    on_late = _late_arrival_handler("stage2", rankers, late_arrivals)
+    seen = 0
+    async for index, response in iter_as_completed(
+        tasks, COUNCIL_MAX_CONCURRENCY, COUNCIL_QUORUM_STAGE2, COUNCIL_QUORUM_WAIT_STAGE2, on_late
+    ):
+        seen += 1
         if response is not None:
+            record_call("stage2", response.get('usage'))
             full_text = response.get('content', '')
-            parsed = parse_ranking_from_text(full_text)
-            stage2_results.append({
-                "model": model,
-                "ranking": full_text,
-                "parsed_ranking": parsed
-            })
+            structured = parse_ranking_json(full_text) if mode == "json" else None
+            if structured:
+                parsed = structured["ranking"]
+            elif mode == "json" and "FINAL RANKING:" not in full_text:
+                parsed = []
+            else:
+                parsed = parse_ranking_from_text(full_text)
+            labels = assignments[index]["labels"]
+            if labels:
+                # Labels the ranker was not shown are dropped rather than
+                # mistaken for the run's label of the same name
+                parsed = [labels[label] for label in parsed if label in labels]
+                full_text = _relabel(full_text, labels)
+                if structured:
+                    structured = {
+                        "ranking": parsed,
+                        "scores": {
+                            labels[label]: {"score": entry["score"], "comment": _relabel(entry["comment"], labels)}
+                            for label, entry in structured["scores"].items() if label in labels
+                        },
+                    }
+            result = {
+                "model": rankers[index],
+                "ranking": format_ranking_json(structured) if structured else full_text,
+                "parsed_ranking": parsed,
+                "backend": response.get('backend'),
+                "usage": response.get('usage')
+            }
+            if structured:
+                result["scores"] = structured["scores"]
+            if assignments[index]["candidates"] is not None:
+                result["candidates"] = assignments[index]["candidates"]
+            yield index, result
+    _count_stragglers("stage2", len(tasks), seen)
+
+
+async def prepare_rankings(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+    judge_ranking: bool = False,
+    extra_rankers: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Set up stage 2: digest the responses and plan the ranking calls.
+
+    With STAGE2_DIGEST_MODE on, the digests are made within half of
+    `timeout`. With `judge_ranking`, STAGE2_JUDGE_MEMBER alone ranks the
+    responses in one call; otherwise `extra_rankers` rank alongside the
+    council members.
+
+    Returns:
+        {"assignments", "label_to_model", "metadata": the stage2_digest
+        and stage2_judge entries of the run metadata, "calls": usage
+        records of the digest calls, "timeout": seconds of `timeout` left
+        for the rankings}
+    """
+    started_at = time.monotonic()
+    ranked_results, digest_info = await condense_responses(user_query, stage1_results, llm_config, timeout / 2)
+    judge = STAGE2_JUDGE_MEMBER if judge_ranking else None
+    assignments, label_to_model = plan_rankings(
+        user_query, ranked_results, STAGE2_RANKING_MODE, judge=judge, extra_rankers=extra_rankers
+    )
 
-    return stage2_results, label_to_model
+    metadata = {}
+    if judge:
+        peer_assignments, _ = plan_rankings(user_query, ranked_results, STAGE2_RANKING_MODE)
+        metadata["stage2_judge"] = judge_metadata(assignments, peer_assignments)
+    if digest_info is not None:
+        metadata["stage2_digest"] = digest_metadata(digest_info, assignments)
+    return {
+        "assignments": assignments,
+        "label_to_model": label_to_model,
+        "metadata": metadata,
+        "calls": digest_info["calls"] if digest_info else [],
+        "timeout": timeout - (time.monotonic() - started_at),
+    }
 
 
-async def stage3_synthesize_final(
+async def stage2_collect_rankings(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
-    stage2_results: List[Dict[str, Any]],
-    llm_config: Optional[Dict[str, str]] = None
-) -> Dict[str, Any]:
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+    late_arrivals: Optional[List[Dict[str, Any]]] = None,
+    judge_ranking: bool = False,
+    extra_rankers: Optional[List[str]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, str], Dict[str, Any], List[Dict[str, Any]]]:
     """
-    Stage 3: Chairman synthesizes final response.
+    Stage 2: Each model ranks the anonymized responses.
+
+    Digests, a single judge and extra rankers are set up by
+    prepare_rankings, within the same `timeout`.
+
+    Returns:
+        Tuple of (stage 2 results, label_to_model, run metadata entries
+        from prepare_rankings, usage records of the digest calls)
+    """
+    plan = await prepare_rankings(user_query, stage1_results, llm_config, timeout, judge_ranking, extra_rankers)
+
+    results_by_index = {}
+    async for index, result in stage2_iter_rankings(
+        plan["assignments"], llm_config, plan["timeout"], STAGE2_RANKING_MODE, late_arrivals
+    ):
+        results_by_index[index] = result
+
+    stage2_results = [results_by_index[i] for i in sorted(results_by_index)]
+    return stage2_results, plan["label_to_model"], plan["metadata"], plan["calls"]
+
+
+def build_chairman_prompt(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]]
+) -> str:
+    """
+    Build the chairman's synthesis prompt from stage 1 and stage 2 results.
+
+    Without stage 2 results (the fast tier) the chairman works from the
+    individual responses alone.
     """
     # Build comprehensive context for chairman
     stage1_text = "\n\n".join([
@@ -150,12 +807,26 @@ async def stage3_synthesize_final(
         for result in stage1_results
     ])
 
+    if not stage2_results:
+        return f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question.
+
+Original Question: {user_query}
+
+Individual Responses:
+{stage1_text}
+
+Your task as Chairman is to synthesize these responses into a single, comprehensive, accurate answer to the user's original question. Consider:
+- The individual responses and their insights
+- Any patterns of agreement or disagreement
+
+Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
+
     stage2_text = "\n\n".join([
         f"Model: {result['model']}\nRanking: {result['ranking']}"
         for result in stage2_results
     ])
 
-    chairman_prompt = f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
+    return f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
 
 Original Question: {user_query}
 
@@ -172,30 +843,502 @@ Your task as Chairman is to synthesize all of this information into a single, co
 
 Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
 
+
+def _chairman_map_prompt(user_query: str, kind: str, items_text: str) -> str:
+    """Prompt summarizing one group of responses or rankings for the chairman."""
+    if kind == "responses":
+        task = ("Summarize the following council responses for the Chairman. For each response keep "
+                "the model name, its key recommendations and anything distinctive or contradicting the others.")
+    else:
+        task = ("Summarize what the following peer evaluations say about response quality: which "
+                "responses are rated strongest and weakest, and why. Refer to responses by their labels.")
+
+    return f"""You are helping the Chairman of a large LLM Council, whose material is too long to read in one go, by summarizing part of it.
+
+Original Question: {user_query}
+
+{task} Be concise.
+
+{items_text}
+
+Summary:"""
+
+
+def build_chairman_reduce_prompt(
+    user_query: str,
+    response_summaries: List[str],
+    ranking_summaries: List[str],
+    aggregate_rankings: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    """Build the chairman's synthesis prompt from group summaries (hierarchical mode)."""
+    stage1_text = "\n\n".join(f"Group {i}:\n{summary}" for i, summary in enumerate(response_summaries, start=1))
+    stage2_text = "\n\n".join(f"Group {i}:\n{summary}" for i, summary in enumerate(ranking_summaries, start=1))
+    rankings_text = ""
+    if aggregate_rankings:
+        rankings_text = "\n\nAGGREGATE RANKINGS (best first):\n" + "\n".join(
+            f"{i}. {entry['model']} (average rank {entry['average_rank']})"
+            for i, entry in enumerate(aggregate_rankings, start=1)
+        )
+
+    return f"""You are the Chairman of an LLM Council. Many models have provided responses to a user's question and ranked each other's responses. The council is large, so its responses and rankings have been summarized in groups.
+
+Original Question: {user_query}
+
+STAGE 1 - Summaries of Individual Responses:
+{stage1_text}
+
+STAGE 2 - Summaries of Peer Rankings:
+{stage2_text}{rankings_text}
+
+Your task as Chairman is to synthesize all of this information into a single, comprehensive, accurate answer to the user's original question. Consider:
+- The individual responses and their insights
+- The peer rankings and what they reveal about response quality
+- Any patterns of agreement or disagreement
+
+Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
+
+
+async def prepare_chairman_prompt(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+    aggregate_rankings: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Build the chairman prompt, hierarchically if the flat one is too large.
+
+    Below CHAIRMAN_MAP_REDUCE_THRESHOLD_TOKENS (estimated) this is just
+    build_chairman_prompt. Above it, groups of CHAIRMAN_MAP_GROUP_SIZE
+    responses and rankings are summarized in parallel (within `timeout`)
+    and the chairman gets build_chairman_reduce_prompt instead. A group
+    whose summary fails is passed on verbatim.
+
+    Returns:
+        Tuple of (prompt, None) or, in hierarchical mode,
+        (prompt, {"groups": number of summaries, "map_calls": their usage records})
+    """
+    flat_prompt = build_chairman_prompt(user_query, stage1_results, stage2_results)
+    estimated = estimate_tokens([{"role": "user", "content": flat_prompt}], 0)
+    if estimated <= CHAIRMAN_MAP_REDUCE_THRESHOLD_TOKENS:
+        return flat_prompt, None
+
+    size = max(CHAIRMAN_MAP_GROUP_SIZE, 1)
+    groups = [
+        ("responses", "\n\n".join(
+            f"Model: {result['model']}\nResponse: {result['response']}" for result in stage1_results[i:i + size]
+        ))
+        for i in range(0, len(stage1_results), size)
+    ] + [
+        ("rankings", "\n\n".join(
+            f"Model: {result['model']}\nRanking: {result['ranking']}" for result in stage2_results[i:i + size]
+        ))
+        for i in range(0, len(stage2_results), size)
+    ]
+    print(f"[Chairman] Prompt ~{estimated} tokens, summarizing {len(groups)} groups first")
+
+    params = generation_params("stage3_map", get_chairman())
+    deadline = time.monotonic() + timeout
+    tasks = [
+        _within(deadline, partial(
+            query_model, get_chairman(), [{"role": "user", "content": _chairman_map_prompt(user_query, kind, text)}],
+            llm_config, params=params
+        ))
+        for kind, text in groups
+    ]
+    summaries = [None] * len(groups)
+    map_calls = []
+    async for index, response in iter_as_completed(tasks, COUNCIL_MAX_CONCURRENCY):
+        if response is not None:
+            record_call("stage3", response.get('usage'))
+            map_calls.append(response.get('usage'))
+            summaries[index] = response.get('content', '')
+
+    response_summaries = []
+    ranking_summaries = []
+    for (kind, text), summary in zip(groups, summaries):
+        target = response_summaries if kind == "responses" else ranking_summaries
+        target.append(summary if summary else text)
+
+    prompt = build_chairman_reduce_prompt(user_query, response_summaries, ranking_summaries, aggregate_rankings)
+    return prompt, {"groups": len(groups), "map_calls": map_calls}
+
+
+def build_chairman_draft_prompt(user_query: str, stage1_results: List[Dict[str, Any]]) -> str:
+    """
+    Build the speculative chairman prompt from stage 1 alone.
+
+    The draft ends with an EMPHASIS: line naming the responses it relies on
+    most, which is later checked against the peer rankings.
+    """
+    stage1_text = "\n\n".join([
+        f"Model: {result['model']}\nResponse: {result['response']}"
+        for result in stage1_results
+    ])
+
+    return f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question.
+
+Original Question: {user_query}
+
+Individual Responses:
+{stage1_text}
+
+Your task as Chairman is to synthesize these responses into a single, comprehensive, accurate answer to the user's original question. Consider:
+- The individual responses and their insights
+- Any patterns of agreement or disagreement
+
+Provide a clear, well-reasoned final answer that represents the council's collective wisdom. Then finish with one last line of the form:
+EMPHASIS: <model>, <model>, ...
+naming the models whose responses your answer relies on most, strongest first."""
+
+
+def build_chairman_refine_prompt(
+    user_query: str,
+    draft: str,
+    aggregate_rankings: List[Dict[str, Any]]
+) -> str:
+    """Build the prompt revising a speculative draft against the peer rankings."""
+    rankings_text = "\n".join(
+        f"{i}. {entry['model']} (average rank {entry['average_rank']} across {entry['rankings_count']} rankings)"
+        for i, entry in enumerate(aggregate_rankings, start=1)
+    )
+
+    return f"""You are the Chairman of an LLM Council. You drafted an answer from the council's individual responses before the peer rankings were in. The rankings are now available.
+
+Original Question: {user_query}
+
+YOUR DRAFT:
+{draft}
+
+PEER RANKINGS (best first):
+{rankings_text}
+
+Revise the draft so it reflects the peer rankings: give more weight to points from higher-ranked responses and qualify points that rest only on lower-ranked ones. Keep everything that still holds and do not mention the ranking process.
+
+Provide only the final answer:"""
+
+
+def start_chairman_draft(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0
+) -> "asyncio.Task":
+    """
+    Start the speculative chairman draft so it overlaps with stage 2.
+
+    The task resolves to the query_model response (None on failure); pass
+    it to stage3_synthesize_final(_stream) as `draft`, and cancel it if the
+    run ends before stage 3 takes it.
+    """
+    messages = [{"role": "user", "content": build_chairman_draft_prompt(user_query, stage1_results)}]
+    return asyncio.ensure_future(query_model(
+        get_chairman(), messages, llm_config, timeout, generation_params("stage3", get_chairman())
+    ))
+
+
+def _split_emphasis(draft_text: str) -> Tuple[str, List[str]]:
+    """Separate a draft's trailing EMPHASIS: line from its text."""
+    matches = list(re.finditer(r'^[ \t*_]*EMPHASIS:[ \t*_]*(.*)$', draft_text, re.MULTILINE | re.IGNORECASE))
+    if not matches:
+        return draft_text.strip(), []
+    match = matches[-1]
+    models = [name.strip(" *_.") for name in match.group(1).split(",") if name.strip(" *_.")]
+    text = draft_text[:match.start()] + draft_text[match.end():]
+    return text.strip(), models
+
+
+def draft_agrees(emphasis: List[str], aggregate_rankings: List[Dict[str, Any]]) -> bool:
+    """Whether the response the draft leaned on most is the one the rankers put first."""
+    if not aggregate_rankings:
+        return True
+    return bool(emphasis) and emphasis[0].lower() == aggregate_rankings[0]["model"].lower()
+
+
+async def _take_draft(
+    draft: "asyncio.Task",
+    aggregate_rankings: List[Dict[str, Any]],
+    timeout: float
+) -> Optional[Tuple[str, Dict[str, Any], bool]]:
+    """
+    Wait for a speculative draft and check it against the rankings.
+
+    Returns:
+        (draft text, draft response, whether the rankings agree), or None
+        if the draft failed or did not finish within `timeout`
+    """
+    try:
+        response = await asyncio.wait_for(draft, max(timeout, 0))
+    except asyncio.TimeoutError:
+        response = None
+    if response is None:
+        print("[Speculative] Chairman draft unavailable, synthesizing from scratch")
+        return None
+    record_call("stage3", response.get('usage'))
+    text, emphasis = _split_emphasis(response.get('content', ''))
+    return text, response, draft_agrees(emphasis, aggregate_rankings)
+
+
+async def stage3_synthesize_final(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+    draft: Optional["asyncio.Task"] = None,
+    aggregate_rankings: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Stage 3: Chairman synthesizes final response.
+
+    With a speculative `draft` (see start_chairman_draft), the draft is
+    returned as is when `aggregate_rankings` agree with its emphasis, and
+    revised against them otherwise; result['speculative'] records which.
+
+    Large councils are synthesized hierarchically (see
+    prepare_chairman_prompt); result['hierarchical'] then holds the number
+    of group summaries and their usage.
+    """
+    started_at = time.monotonic()
+    if draft is not None:
+        taken = await _take_draft(draft, aggregate_rankings or [], timeout)
+        if taken is not None:
+            text, draft_response, agrees = taken
+            if agrees:
+                return {
+                    "model": get_chairman(),
+                    "response": text,
+                    "backend": draft_response.get('backend'),
+                    "usage": draft_response.get('usage'),
+                    "speculative": {"outcome": "accepted"}
+                }
+            messages = [{"role": "user", "content": build_chairman_refine_prompt(user_query, text, aggregate_rankings)}]
+            response = await query_model(
+                get_chairman(), messages, llm_config, timeout - (time.monotonic() - started_at),
+                generation_params("stage3", get_chairman())
+            )
+            if response is None:
+                # An unrefined draft still beats no answer
+                return {
+                    "model": get_chairman(),
+                    "response": text,
+                    "backend": draft_response.get('backend'),
+                    "usage": draft_response.get('usage'),
+                    "speculative": {"outcome": "unrefined"}
+                }
+            record_call("stage3", response.get('usage'))
+            return {
+                "model": get_chairman(),
+                "response": response.get('content', ''),
+                "backend": response.get('backend'),
+                "usage": response.get('usage'),
+                "speculative": {"outcome": "refined", "draft_usage": draft_response.get('usage')}
+            }
+        timeout -= time.monotonic() - started_at
+
+    # Summaries get at most half of the stage; the chairman needs the rest
+    map_started_at = time.monotonic()
+    chairman_prompt, hierarchical = await prepare_chairman_prompt(
+        user_query, stage1_results, stage2_results, llm_config, timeout / 2, aggregate_rankings
+    )
+    timeout -= time.monotonic() - map_started_at
     messages = [{"role": "user", "content": chairman_prompt}]
 
     # Query the chairman model
-    response = await query_model(get_chairman(), messages, llm_config)
+    response = await query_model(
+        get_chairman(), messages, llm_config, timeout, generation_params("stage3", get_chairman())
+    )
 
     if response is None:
         # Fallback if chairman fails
-        return {
+        result = {
             "model": get_chairman(),
             "response": "Error: Unable to generate final synthesis."
         }
+    else:
+        record_call("stage3", response.get('usage'))
+        result = {
+            "model": get_chairman(),
+            "response": response.get('content', ''),
+            "backend": response.get('backend'),
+            "usage": response.get('usage')
+        }
+    if hierarchical:
+        result["hierarchical"] = hierarchical
+    return result
 
-    return {
+
+async def stage3_synthesize_final_stream(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+    draft: Optional["asyncio.Task"] = None,
+    aggregate_rankings: Optional[List[Dict[str, Any]]] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stage 3 with token streaming.
+
+    Yields ("delta", text) tuples as the chairman generates, then a single
+    ("complete", result) tuple. The result's response is exactly the
+    concatenation of the deltas, so it matches what the client rendered.
+
+    With a speculative `draft`, an accepted draft is sent as one delta and
+    a refinement is streamed (see stage3_synthesize_final). Large councils
+    are synthesized hierarchically, as in stage3_synthesize_final.
+
+    If the stream breaks after deltas were sent, the result holds the text
+    received so far and is flagged 'truncated'; it has no usage record.
+    """
+    started_at = time.monotonic()
+    chairman_prompt = None
+    speculative = None
+    hierarchical = None
+    if draft is not None:
+        taken = await _take_draft(draft, aggregate_rankings or [], timeout)
+        if taken is not None:
+            text, draft_response, agrees = taken
+            if agrees:
+                yield ("delta", text)
+                yield ("complete", {
+                    "model": get_chairman(),
+                    "response": text,
+                    "backend": draft_response.get('backend'),
+                    "usage": draft_response.get('usage'),
+                    "speculative": {"outcome": "accepted"}
+                })
+                return
+            chairman_prompt = build_chairman_refine_prompt(user_query, text, aggregate_rankings)
+            speculative = {"outcome": "refined", "draft_usage": draft_response.get('usage')}
+            unrefined = {
+                "model": get_chairman(),
+                "response": text,
+                "backend": draft_response.get('backend'),
+                "usage": draft_response.get('usage'),
+                "speculative": {"outcome": "unrefined"}
+            }
+    if chairman_prompt is None:
+        # Summaries get at most half of what is left; the chairman needs the rest
+        chairman_prompt, hierarchical = await prepare_chairman_prompt(
+            user_query, stage1_results, stage2_results, llm_config,
+            (timeout - (time.monotonic() - started_at)) / 2, aggregate_rankings
+        )
+    messages = [{"role": "user", "content": chairman_prompt}]
+
+    chunks = []
+    served = {}
+    params = generation_params("stage3", get_chairman())
+    remaining = timeout - (time.monotonic() - started_at)
+    try:
+        async for delta in query_model_stream(get_chairman(), messages, llm_config, remaining, served, params):
+            chunks.append(delta)
+            yield ("delta", delta)
+    except Exception as e:
+        print(f"Error streaming chairman synthesis: {e}")
+        if not chunks and speculative:
+            # An unrefined draft still beats no answer
+            yield ("delta", unrefined["response"])
+            yield ("complete", unrefined)
+            return
+        if not chunks:
+            # Nothing reached the client yet, so fall back to a normal call
+            remaining = timeout - (time.monotonic() - started_at)
+            if remaining > 0:
+                yield ("complete", await stage3_synthesize_final(
+                    user_query, stage1_results, stage2_results, llm_config, remaining,
+                    aggregate_rankings=aggregate_rankings
+                ))
+            else:
+                yield ("complete", {
+                    "model": get_chairman(),
+                    "response": "Error: Unable to generate final synthesis."
+                })
+            return
+        # Part of the answer is already on the client; keep it, but flagged
+        yield ("complete", {
+            "model": get_chairman(),
+            "response": "".join(chunks),
+            "backend": served.get("backend"),
+            "usage": None,
+            "truncated": True
+        })
+        return
+
+    record_call("stage3", served.get("usage"))
+    result = {
         "model": get_chairman(),
-        "response": response.get('content', '')
+        "response": "".join(chunks),
+        "backend": served.get("backend"),
+        "usage": served.get("usage")
     }
+    if speculative:
+        result["speculative"] = speculative
+    if hierarchical:
+        result["hierarchical"] = hierarchical
+    yield ("complete", result)
+
+
+def _normalize_label(label: str) -> Optional[str]:
+    """Accept "Response A", "A" or "response a" as the label "Response A"."""
+    match = re.fullmatch(r'(?:Response\s+)?([A-Z]+)', label.strip(), re.IGNORECASE)
+    return f"Response {match.group(1).upper()}" if match else None
+
+
+def parse_ranking_json(ranking_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a structured (json mode) stage 2 answer.
+
+    Returns:
+        {"ranking": [labels best to worst], "scores": {label: {"score", "comment"}}},
+        or None if the text is not a usable ranking
+    """
+    text = ranking_text.strip()
+    # Some providers wrap JSON in a markdown fence despite response_format
+    fenced = re.match(r'^```(?:json)?\s*(.*?)\s*```$', text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("ranking"), list):
+        return None
+
+    ranking = []
+    for label in data["ranking"]:
+        normalized = _normalize_label(label) if isinstance(label, str) else None
+        if normalized and normalized not in ranking:
+            ranking.append(normalized)
+    if not ranking:
+        return None
+
+    scores = {}
+    for evaluation in data.get("evaluations") or []:
+        if not isinstance(evaluation, dict) or not isinstance(evaluation.get("label"), str):
+            continue
+        label = _normalize_label(evaluation["label"])
+        if label:
+            scores[label] = {"score": evaluation.get("score"), "comment": evaluation.get("comment", "")}
+
+    return {"ranking": ranking, "scores": scores}
+
+
+def format_ranking_json(structured: Dict[str, Any]) -> str:
+    """Render a structured ranking as the text shown in the UI (and given to the chairman)."""
+    lines = [
+        f"**{label}** ({entry['score']}/10): {entry['comment']}"
+        for label, entry in sorted(structured["scores"].items())
+    ]
+    ranking = "\n".join(f"{i}. {label}" for i, label in enumerate(structured["ranking"], start=1))
+    return "\n".join(lines) + f"\n\nFINAL RANKING:\n{ranking}"
 
 
 def parse_ranking_from_text(ranking_text: str) -> List[str]:
     """
     Parse the FINAL RANKING section from the model's response.
     """
-    import re
-
     # Look for "FINAL RANKING:" section
     if "FINAL RANKING:" in ranking_text:
         # Extract everything after "FINAL RANKING:"
@@ -204,17 +1347,17 @@ def parse_ranking_from_text(ranking_text: str) -> List[str]:
             ranking_section = parts[1]
             # Try to extract numbered list format (e.g., "1. Response A")
             # This pattern looks for: number, period, optional space, "Response X"
-            numbered_matches = re.findall(r'\d+\.\s*Response [A-Z]', ranking_section)
+            numbered_matches = re.findall(r'\d+\.\s*Response [A-Z]+\b', ranking_section)
             if numbered_matches:
                 # Extract just the "Response X" part
-                return [re.search(r'Response [A-Z]', m).group() for m in numbered_matches]
+                return [re.search(r'Response [A-Z]+\b', m).group() for m in numbered_matches]
 
             # Fallback: Extract all "Response X" patterns in order
-            matches = re.findall(r'Response [A-Z]', ranking_section)
+            matches = re.findall(r'Response [A-Z]+\b', ranking_section)
             return matches
 
     # Fallback: try to find any "Response X" patterns in order
-    matches = re.findall(r'Response [A-Z]', ranking_text)
+    matches = re.findall(r'Response [A-Z]+\b', ranking_text)
     return matches
 
 
@@ -224,33 +1367,55 @@ def calculate_aggregate_rankings(
 ) -> List[Dict[str, Any]]:
     """
     Calculate aggregate rankings across all models.
-    """
-    from collections import defaultdict
 
-    # Track positions for each model
+    Only the rankers that answered count (a quorum can leave some out), and
+    a ranker with no usable ranking is skipped. Responses a ranker left out
+    of its ranking share the positions after the ones it ranked, so every
+    model is averaged over the same set of rankers.
+
+    A sampled (partial) ranking only covers its 'candidates'; its positions
+    are stretched onto the full 1..N scale so that they average with full
+    rankings into one aggregate.
+    """
+    # Track positions (and json-mode scores) for each model
     model_positions = defaultdict(list)
+    model_scores = defaultdict(list)
 
     for ranking in stage2_results:
-        ranking_text = ranking['ranking']
-
-        # Parse the ranking from the structured format
-        parsed_ranking = parse_ranking_from_text(ranking_text)
-
-        for position, label in enumerate(parsed_ranking, start=1):
-            if label in label_to_model:
-                model_name = label_to_model[label]
-                model_positions[model_name].append(position)
+        for label, entry in ranking.get('scores', {}).items():
+            if label in label_to_model and isinstance(entry.get('score'), (int, float)):
+                model_scores[label_to_model[label]].append(entry['score'])
+
+        parsed_ranking = ranking.get('parsed_ranking')
+        if parsed_ranking is None:
+            parsed_ranking = parse_ranking_from_text(ranking['ranking'])
+        candidates = [label for label in ranking.get('candidates') or label_to_model if label in label_to_model]
+        ranked = [label for label in dict.fromkeys(parsed_ranking) if label in candidates]
+        if not ranked:
+            continue
+
+        # Position p of k candidates maps to 1 + (p - 1) * (N - 1) / (k - 1)
+        scale = (len(label_to_model) - 1) / (len(candidates) - 1) if len(candidates) > 1 else 0.0
+        for position, label in enumerate(ranked, start=1):
+            model_positions[label_to_model[label]].append(1 + (position - 1) * scale)
+        unranked = [label for label in candidates if label not in ranked]
+        shared_position = 1 + ((len(ranked) + 1 + len(candidates)) / 2 - 1) * scale
+        for label in unranked:
+            model_positions[label_to_model[label]].append(shared_position)
 
     # Calculate average position for each model
     aggregate = []
     for model, positions in model_positions.items():
         if positions:
             avg_rank = sum(positions) / len(positions)
-            aggregate.append({
+            entry = {
                 "model": model,
                 "average_rank": round(avg_rank, 2),
                 "rankings_count": len(positions)
-            })
+            }
+            if model_scores[model]:
+                entry["average_score"] = round(sum(model_scores[model]) / len(model_scores[model]), 2)
+            aggregate.append(entry)
 
     # Sort by average rank (lower is better)
     aggregate.sort(key=lambda x: x['average_rank'])
@@ -258,9 +1423,15 @@ def calculate_aggregate_rankings(
     return aggregate
 
 
-async def generate_conversation_title(user_query: str, llm_config: Optional[Dict[str, str]] = None) -> str:
+async def generate_conversation_title(
+    user_query: str,
+    llm_config: Optional[Dict[str, str]] = None,
+    served: Optional[Dict[str, Any]] = None
+) -> str:
     """
     Generate a short title for a conversation.
+
+    If `served` is given, its 'usage' key is set to the call's usage.
     """
     title_prompt = f"""Generate a very short title (3-5 words maximum) that summarizes the following question.
 The title should be concise and descriptive. Do not use quotes or punctuation in the title.
@@ -275,11 +1446,17 @@ Title:"""
     # We'll just reuse the user's config to be simple (so 'gpt-4o' or 'claude-3.5-sonnet')
     # If using deepseek or anthropic, it will use that.
     
-    response = await query_model("title-gen", messages, llm_config, timeout=30.0)
+    response = await query_model(
+        "title-gen", messages, llm_config, timeout=30.0, params=generation_params("title", "title-gen")
+    )
 
     if response is None:
         return "New Conversation"
 
+    record_call("title", response.get('usage'))
+    if served is not None:
+        served["usage"] = response.get('usage')
+
     title = response.get('content', 'New Conversation').strip()
     title = title.strip('"\'')
     if len(title) > 50:
@@ -288,32 +1465,81 @@ Title:"""
     return title
 
 
-async def run_full_council(user_query: str, custom_roles: Optional[List[Dict]] = None, llm_config: Optional[Dict[str, str]] = None) -> Tuple[List, List, Dict, Dict]:
+async def run_full_council(
+    user_query: str,
+    custom_roles: Optional[List[Dict]] = None,
+    llm_config: Optional[Dict[str, str]] = None,
+    deadline_seconds: Optional[float] = None,
+    judge_ranking: bool = False,
+    tier: str = COUNCIL_DEFAULT_TIER
+) -> Tuple[List, List, Dict, Dict]:
     """
     Run the complete 3-stage council process with BYOK support.
-    """
-    # Stage 1: Collect individual responses
-    stage1_results = await stage1_collect_responses(user_query, custom_roles, llm_config)
 
-    # Stage 2: Collect rankings
-    stage2_results, label_to_model = await stage2_collect_rankings(user_query, stage1_results, llm_config)
+    The run is bounded by `deadline_seconds` (COUNCIL_DEADLINE_SECONDS by
+    default), split across the stages by CouncilDeadline. Stages 1 and 2
+    move on once their quorum is met; stragglers that answer later are
+    listed in metadata['late_arrivals'].
 
-    # Calculate aggregate rankings
-    aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+    With `judge_ranking`, stage 2 is a single STAGE2_JUDGE_MEMBER call
+    instead of peer review; its savings are in metadata['stage2_judge'].
+
+    `tier` (one of COUNCIL_TIERS) trades depth for latency: "fast" skips
+    stage 2, "thorough" adds STAGE2_JUDGE_MEMBER as a ranker and never
+    uses a speculative draft. judge_ranking only applies to "standard".
+    """
+    if tier not in COUNCIL_TIERS:
+        raise ValueError(f"Unknown council tier '{tier}', expected one of {', '.join(COUNCIL_TIERS)}")
+    deadline = CouncilDeadline(deadline_seconds, tier_stage_weights(tier))
+    # Members that answered after their stage moved on without them
+    late_arrivals = []
 
-    # Stage 3: Synthesize final answer
-    stage3_result = await stage3_synthesize_final(
-        user_query,
-        stage1_results,
-        stage2_results,
-        llm_config
+    # Stage 1: Collect individual responses
+    stage1_results = await stage1_collect_responses(
+        user_query, custom_roles, llm_config, deadline.stage_timeout(1), late_arrivals
     )
 
+    # Speculative chairman draft, overlapping stage 2
+    draft = None
+    if CHAIRMAN_SPECULATIVE and tier == "standard":
+        draft = start_chairman_draft(user_query, stage1_results, llm_config, deadline.remaining())
+
+    try:
+        # Stage 2: Collect rankings (the fast tier goes straight to the chairman)
+        stage2_results, label_to_model, stage2_metadata, digest_calls = [], {}, {}, []
+        if tier != "fast":
+            stage2_results, label_to_model, stage2_metadata, digest_calls = await stage2_collect_rankings(
+                user_query, stage1_results, llm_config, deadline.stage_timeout(2), late_arrivals,
+                judge_ranking and tier == "standard", tier_extra_rankers(tier)
+            )
+
+        # Calculate aggregate rankings
+        aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+
+        # Stage 3: Synthesize final answer
+        stage3_result = await stage3_synthesize_final(
+            user_query,
+            stage1_results,
+            stage2_results,
+            llm_config,
+            deadline.stage_timeout(3),
+            draft,
+            aggregate_rankings
+        )
+    finally:
+        # A draft stage 3 never took (stage 2 failed, or the run was
+        # cancelled) would keep running and be billed for nothing
+        if draft is not None:
+            draft.cancel()
+
     # Prepare metadata
     metadata = {
+        "tier": tier,
         "label_to_model": label_to_model,
-        "aggregate_rankings": aggregate_rankings
+        "aggregate_rankings": aggregate_rankings,
+        "usage": summarize_run(stage1_results, stage2_results, stage3_result, {"stage2": digest_calls}),
+        "late_arrivals": list(late_arrivals),
+        **stage2_metadata
     }
 
     return stage1_results, stage2_results, stage3_result, metadata
-
@@ -0,0 +1,94 @@
+"""Cross-backend failover for council calls.
+
+Each council member has an ordered chain of backends: the request's own
+(Azure) first, then FAILOVER_CHAINS (OpenRouter models by default). A
+backend is skipped while it is over its error budget or its circuit is
+open, and a call that outlives FAILOVER_LATENCY_BUDGET_SECONDS or fails
+on one backend moves to the next within the same council run.
+"""
+
+from typing import Dict, Any, List
+
+from .azure_router import router as azure_router
+from .circuit_breaker import get_circuit_breaker, CircuitBreaker
+from .config import (
+    OPENROUTER_API_KEY,
+    FAILOVER_ENABLED,
+    FAILOVER_CHAINS,
+    FAILOVER_DEFAULT_CHAIN,
+    FAILOVER_LATENCY_BUDGET_SECONDS,
+    FAILOVER_ERROR_BUDGET,
+    CIRCUIT_MIN_CALLS,
+)
+
+# Providers whose calls fail over; BYOK providers stay on the user's key
+FAILOVER_PRIMARIES = ("azure",)
+
+_stats: Dict[str, int] = {}
+
+
+def _server_api_key(provider: str) -> str:
+    """API key the server holds for a fallback provider."""
+    if provider == "openrouter":
+        return OPENROUTER_API_KEY or ""
+    return ""
+
+
+def backend_chain(member_key: str, provider: str, model: str, api_key: str) -> List[Dict[str, str]]:
+    """
+    Ordered backends to try for one call.
+
+    Args:
+        member_key: Council member ID ('custom' and 'title-gen' use the default chain)
+        provider: Provider the request asked for
+        model: Model the request asked for
+        api_key: Key sent with the request
+
+    Returns:
+        List of {"provider", "model", "api_key"}, primary first
+    """
+    chain = [{"provider": provider, "model": model, "api_key": api_key}]
+    if FAILOVER_ENABLED and provider in FAILOVER_PRIMARIES:
+        for fallback_provider, fallback_model in FAILOVER_CHAINS.get(member_key, FAILOVER_DEFAULT_CHAIN):
+            chain.append({
+                "provider": fallback_provider,
+                "model": fallback_model,
+                "api_key": _server_api_key(fallback_provider),
+            })
+    return chain
+
+
+def _breakers(provider: str, model: str) -> List[CircuitBreaker]:
+    if provider == "azure":
+        return [target.breaker for target in azure_router.targets]
+    return [get_circuit_breaker(provider, model)]
+
+
+def _breaker_over_budget(breaker: CircuitBreaker) -> bool:
+    if not breaker.available():
+        return True
+    snapshot = breaker.snapshot()
+    if snapshot["calls"] >= CIRCUIT_MIN_CALLS and snapshot["error_rate"] > FAILOVER_ERROR_BUDGET:
+        return True
+    p95 = snapshot["latency_p95"]
+    return p95 is not None and p95 > FAILOVER_LATENCY_BUDGET_SECONDS
+
+
+def over_budget(provider: str, model: str) -> bool:
+    """Whether every deployment behind a backend is past its error or latency budget."""
+    return all(_breaker_over_budget(breaker) for breaker in _breakers(provider, model))
+
+
+def record_failover(member_key: str, source: Dict[str, str], target: Dict[str, str], reason: str):
+    """Log and count a move down the chain."""
+    edge = f"{source['provider']}->{target['provider']}"
+    _stats[edge] = _stats.get(edge, 0) + 1
+    print(
+        f"[Failover] {member_key}: {source['provider']}/{source['model']} -> "
+        f"{target['provider']}/{target['model']} ({reason})"
+    )
+
+
+def get_failover_stats() -> Dict[str, Any]:
+    """Failover counts per backend pair."""
+    return {"enabled": FAILOVER_ENABLED, "failovers": dict(_stats)}
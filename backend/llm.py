@@ -1,20 +1,62 @@
 
 import os
 import litellm
-from typing import List, Dict, Any, Optional
+from . import mock_llm
+from typing import List, Dict, Any, Optional, AsyncIterator
+
+# Providers that report token usage at the end of a stream when asked
+STREAM_USAGE_PROVIDERS = ("openai", "azure", "deepseek", "openrouter")
+
+# Providers that accept response_format={"type": "json_schema", ...};
+# the rest are asked for plain JSON ("json_object") instead
+JSON_SCHEMA_PROVIDERS = ("openai", "azure", "openrouter", "mock")
+
+
+def _approx_tokens(text: str) -> int:
+    """~4 characters per token, for calls whose provider reports no usage."""
+    return len(text or "") // 4
+
 
 class LLMService:
     @staticmethod
-    def generate_response(
-        messages: List[Dict[str, str]], 
-        provider: str, 
-        model: str, 
+    def _result(response: Any) -> Dict[str, Any]:
+        """Content, finish reason and the usage block of a litellm response (0 when the provider sends none)."""
+        usage = getattr(response, "usage", None)
+        return {
+            "content": response.choices[0].message.content,
+            "finish_reason": getattr(response.choices[0], "finish_reason", None),
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        }
+
+    @staticmethod
+    def _estimated_result(messages: List[Dict[str, str]], content: str) -> Dict[str, Any]:
+        """Result for a provider without a usage block (the mock), with estimated tokens."""
+        return {
+            "content": content,
+            "finish_reason": "stop",
+            "prompt_tokens": sum(_approx_tokens(m.get("content")) for m in messages),
+            "completion_tokens": _approx_tokens(content),
+        }
+
+    @staticmethod
+    def _build_completion_kwargs(
+        messages: List[Dict[str, str]],
+        provider: str,
+        model: str,
         api_key: str,
-        temperature: float = 0.7
-    ) -> str:
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        api_base: Optional[str] = None,
+        api_version: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Unified generation method supporting OpenAI, Azure, Anthropic, Google, and DeepSeek.
-        Uses litellm to handle provider differences.
+        Build the litellm completion arguments for a provider.
+        Shared by the sync and async generation paths. api_base and
+        api_version select the Azure endpoint a call is routed to; params
+        holds extra generation arguments (max_tokens, temperature, stop,
+        seed, response_format, ...) and takes precedence over `temperature`.
         """
         
         # Configure litellm environment variables based on provider
@@ -45,6 +87,10 @@ class LLMService:
         elif provider == "deepseek":
             env_updates["DEEPSEEK_API_KEY"] = api_key
             completion_model = f"deepseek/{model}" if not model.startswith("deepseek") else model
+
+        elif provider == "openrouter":
+            # Failover backend; model is an OpenRouter id like "openai/gpt-4o"
+            completion_model = f"openrouter/{model}"
             
         else:
             raise ValueError(f"Unsupported provider: {provider}")
@@ -54,33 +100,183 @@ class LLMService:
         # But modifying os.environ is not thread-safe in async apps.
         # Better to pass api_key directly to completion where possible.
         
-        try:
-            # Prepare arguments for litellm
-            kwargs = {
-                "model": completion_model if provider != "azure" else f"azure/{model}",
-                "messages": messages,
-                "temperature": temperature,
-            }
-
-            # Map specific API keys
-            if provider == "openai":
-                kwargs["api_key"] = api_key
-            elif provider == "anthropic":
-                kwargs["api_key"] = api_key
-            elif provider == "google":
-                kwargs["api_key"] = api_key
-            elif provider == "deepseek":
+        # Prepare arguments for litellm
+        kwargs = {
+            "model": completion_model if provider != "azure" else f"azure/{model}",
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        for key, value in (params or {}).items():
+            if value is not None:
+                kwargs[key] = value
+        if params:
+            # Skip arguments a provider does not support (e.g. seed on
+            # Anthropic) instead of failing the call
+            kwargs["drop_params"] = True
+        response_format = kwargs.get("response_format")
+        if response_format and response_format.get("type") == "json_schema" and provider not in JSON_SCHEMA_PROVIDERS:
+            kwargs["response_format"] = {"type": "json_object"}
+
+        # Map specific API keys
+        if provider == "openai":
+            kwargs["api_key"] = api_key
+        elif provider == "anthropic":
+            kwargs["api_key"] = api_key
+        elif provider == "google":
+            kwargs["api_key"] = api_key
+        elif provider == "deepseek":
+            kwargs["api_key"] = api_key
+            kwargs["base_url"] = "https://api.deepseek.com" # standard DeepSeek endpoint
+        elif provider == "openrouter":
+            kwargs["api_key"] = api_key
+
+        # For Azure fallback (if provider is 'azure' or default)
+        if provider == "azure":
+            # The router picks the endpoint; anything unset falls back to
+            # the environment variables already set in the container
+            if api_base:
+                kwargs["api_base"] = api_base
+            if api_key:
                 kwargs["api_key"] = api_key
-                kwargs["base_url"] = "https://api.deepseek.com" # standard DeepSeek endpoint
+            if api_version:
+                kwargs["api_version"] = api_version
+
+        return kwargs
+
+    @staticmethod
+    def generate_response(
+        messages: List[Dict[str, str]], 
+        provider: str, 
+        model: str, 
+        api_key: str,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        api_base: Optional[str] = None,
+        api_version: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Unified generation method supporting OpenAI, Azure, Anthropic, Google, DeepSeek
+        and OpenRouter (plus the offline 'mock' provider). Uses litellm to handle provider differences.
+
+        Returns a dict with 'content', 'finish_reason' ("length" when cut off
+        by max_tokens), 'prompt_tokens' and 'completion_tokens'.
+        This call blocks; async callers should use agenerate_response instead.
+        """
+        if provider == "mock":
+            content = mock_llm.generate(messages, model, **{"temperature": temperature, **(params or {})})
+            return LLMService._estimated_result(messages, content)
 
-            # For Azure fallback (if provider is 'azure' or default)
-            if provider == "azure":
-               # handled by environment variables already set in container
-               pass
+        kwargs = LLMService._build_completion_kwargs(
+            messages, provider, model, api_key, temperature, timeout, api_base, api_version, params
+        )
 
+        try:
             response = litellm.completion(**kwargs)
-            return response.choices[0].message.content
+            return LLMService._result(response)
 
         except Exception as e:
             print(f"LLM Generation Error ({provider}/{model}): {str(e)}")
             raise e
+
+    @staticmethod
+    async def agenerate_response(
+        messages: List[Dict[str, str]],
+        provider: str,
+        model: str,
+        api_key: str,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        api_base: Optional[str] = None,
+        api_version: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of generate_response built on litellm.acompletion.
+
+        Does not block the event loop, so concurrent council calls
+        (asyncio.gather) genuinely overlap.
+        """
+        if provider == "mock":
+            content = await mock_llm.agenerate(messages, model, **{"temperature": temperature, **(params or {})})
+            return LLMService._estimated_result(messages, content)
+
+        kwargs = LLMService._build_completion_kwargs(
+            messages, provider, model, api_key, temperature, timeout, api_base, api_version, params
+        )
+
+        try:
+            response = await litellm.acompletion(**kwargs)
+            return LLMService._result(response)
+
+        except Exception as e:
+            print(f"LLM Generation Error ({provider}/{model}): {str(e)}")
+            raise e
+
+    @staticmethod
+    async def astream_response(
+        messages: List[Dict[str, str]],
+        provider: str,
+        model: str,
+        api_key: str,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None,
+        api_base: Optional[str] = None,
+        api_version: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response as incremental text chunks.
+
+        Concatenating every yielded chunk gives the same text that
+        agenerate_response would have returned. When the stream ends,
+        `usage` (if given) is filled with 'prompt_tokens' and
+        'completion_tokens', estimated if the provider does not report them,
+        and the 'finish_reason' of the last choice.
+        """
+        chunks = []
+        if provider == "mock":
+            async for delta in mock_llm.astream(messages, model, **{"temperature": temperature, **(params or {})}):
+                chunks.append(delta)
+                yield delta
+            if usage is not None:
+                estimate = LLMService._estimated_result(messages, "".join(chunks))
+                usage["prompt_tokens"] = estimate["prompt_tokens"]
+                usage["completion_tokens"] = estimate["completion_tokens"]
+                usage["finish_reason"] = "stop"
+            return
+
+        kwargs = LLMService._build_completion_kwargs(
+            messages, provider, model, api_key, temperature, timeout, api_base, api_version, params
+        )
+        kwargs["stream"] = True
+        if provider in STREAM_USAGE_PROVIDERS:
+            kwargs["stream_options"] = {"include_usage": True}
+
+        try:
+            reported = None
+            finish_reason = None
+            response = await litellm.acompletion(**kwargs)
+            async for chunk in response:
+                if getattr(chunk, "usage", None):
+                    reported = chunk.usage
+                if not chunk.choices:
+                    continue
+                finish_reason = getattr(chunk.choices[0], "finish_reason", None) or finish_reason
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+
+            if usage is not None:
+                estimate = LLMService._estimated_result(messages, "".join(chunks))
+                usage["prompt_tokens"] = getattr(reported, "prompt_tokens", 0) or estimate["prompt_tokens"]
+                usage["completion_tokens"] = getattr(reported, "completion_tokens", 0) or estimate["completion_tokens"]
+                usage["finish_reason"] = finish_reason
+
+        except Exception as e:
+            print(f"LLM Streaming Error ({provider}/{model}): {str(e)}")
+            raise e
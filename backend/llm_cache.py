@@ -0,0 +1,201 @@
+"""Two-tier response cache for council LLM calls.
+
+Identical prompts come up constantly: the same educational content is
+re-reviewed, and the same stage 2 prompts are rebuilt on retries. Responses
+are cached by provider, model, generation parameters and a hash of the
+full message list (system prompt included), plus a fingerprint of the
+caller's own API key when one was sent, first in a bounded in-memory
+LRU and optionally on disk under DATA_DIR with a TTL and a size cap.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .config import (
+    DATA_DIR,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_DISK_ENABLED,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_DISK_MAX_MB,
+)
+
+CACHE_DIR = os.path.join(DATA_DIR, "llm_cache")
+# How often the disk tier is rescanned for expired entries and files
+# written by other processes; in between, its size is tracked in memory
+DISK_SWEEP_SECONDS = 600
+
+_memory: "OrderedDict[str, str]" = OrderedDict()
+# Disk entries (path -> size in bytes), oldest first; None until the first scan
+_disk_index: Optional["OrderedDict[str, int]"] = None
+_disk_bytes = 0
+_disk_swept_at = 0.0
+_disk_lock = threading.Lock()
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    api_key: str = "",
+    **params: Any
+) -> str:
+    """
+    Build a cache key from everything that determines the response.
+
+    A caller's own (BYOK) key is part of the key, hashed, so a request is
+    never answered from another user's call; calls on the server's
+    credentials (empty key) share entries.
+
+    Args:
+        provider: LLM provider name
+        model: Model or deployment name
+        messages: Full message list, including the system prompt
+        api_key: API key sent with the request, if any
+        **params: Generation parameters (temperature, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    key = {"provider": provider, "model": model, "params": params, "messages": messages}
+    if api_key:
+        key["credential"] = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    payload = json.dumps(key, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _remember(key: str, content: str):
+    """Insert into the in-memory LRU, evicting the least recently used entry."""
+    _memory[key] = content
+    _memory.move_to_end(key)
+    while len(_memory) > LLM_CACHE_MAX_ENTRIES:
+        _memory.popitem(last=False)
+        _stats["evictions"] += 1
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def _read_disk(key: str) -> Optional[str]:
+    path = _disk_path(key)
+    try:
+        with open(path, "r") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - entry.get("created_at", 0) > LLM_CACHE_TTL_SECONDS:
+        with _disk_lock:
+            _forget_disk(path)
+        return None
+    return entry.get("content")
+
+
+def _forget_disk(path: str):
+    """Delete a disk entry and drop it from the index (caller holds _disk_lock)."""
+    global _disk_bytes
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    if _disk_index is not None and path in _disk_index:
+        _disk_bytes -= _disk_index.pop(path)
+
+
+def _write_disk(key: str, content: str):
+    global _disk_bytes
+    Path(CACHE_DIR).mkdir(parents=True, exist_ok=True)
+    path = _disk_path(key)
+    with open(path, "w") as f:
+        json.dump({"created_at": time.time(), "content": content}, f)
+    size = os.path.getsize(path)
+
+    with _disk_lock:
+        if _disk_index is None or time.monotonic() - _disk_swept_at > DISK_SWEEP_SECONDS:
+            _sweep_disk()
+        else:
+            _disk_bytes += size - _disk_index.pop(path, 0)
+            _disk_index[path] = size
+        _evict_disk()
+
+
+def _sweep_disk():
+    """Rebuild the disk index from the directory, dropping expired entries (caller holds _disk_lock)."""
+    global _disk_index, _disk_bytes, _disk_swept_at
+    now = time.time()
+    entries = []
+    for entry in os.scandir(CACHE_DIR):
+        if not entry.name.endswith(".json"):
+            continue
+        stat = entry.stat()
+        if now - stat.st_mtime > LLM_CACHE_TTL_SECONDS:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            _stats["evictions"] += 1
+            continue
+        entries.append((stat.st_mtime, entry.path, stat.st_size))
+
+    entries.sort()
+    _disk_index = OrderedDict((path, size) for _, path, size in entries)
+    _disk_bytes = sum(_disk_index.values())
+    _disk_swept_at = time.monotonic()
+
+
+def _evict_disk():
+    """Drop the oldest entries until the cache fits its size cap (caller holds _disk_lock)."""
+    max_bytes = LLM_CACHE_DISK_MAX_MB * 1024 * 1024
+    while _disk_bytes > max_bytes and _disk_index:
+        _forget_disk(next(iter(_disk_index)))
+        _stats["evictions"] += 1
+
+
+async def get(key: str) -> Optional[str]:
+    """Look a response up in memory, then on disk. Returns None on a miss."""
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    content = _memory.get(key)
+    if content is not None:
+        _memory.move_to_end(key)
+        _stats["memory_hits"] += 1
+        return content
+
+    if LLM_CACHE_DISK_ENABLED:
+        content = await asyncio.to_thread(_read_disk, key)
+        if content is not None:
+            _remember(key, content)
+            _stats["disk_hits"] += 1
+            return content
+
+    _stats["misses"] += 1
+    return None
+
+
+async def put(key: str, content: str):
+    """Store a response in both tiers."""
+    if not LLM_CACHE_ENABLED or content is None:
+        return
+
+    _remember(key, content)
+    _stats["writes"] += 1
+    if LLM_CACHE_DISK_ENABLED:
+        try:
+            await asyncio.to_thread(_write_disk, key, content)
+        except OSError as e:
+            print(f"[Cache] Error writing disk cache: {e}")
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and current in-memory size."""
+    return {**_stats, "memory_entries": len(_memory), "enabled": LLM_CACHE_ENABLED}
@@ -2,21 +2,406 @@
 """LLM API client using unified LLMService."""
 
 import asyncio
-from typing import List, Dict, Any, Optional
+import json
+import re
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Tuple
+import litellm
 from .llm import LLMService
+from . import llm_cache
+from .azure_router import router as azure_router
+from . import failover
+from .usage import call_usage
+from .rate_limiter import get_rate_limiter, estimate_tokens, retry_after_seconds
+from .resilience import with_retries, with_hedging, is_retryable
+from .circuit_breaker import get_circuit_breaker, CircuitOpenError
 from .config import (
     COUNCIL_MEMBERS,
     CHAIRMAN_ID,
     COUNCIL_ROLES,
     CHAIRMAN_SYSTEM_PROMPT,
     NURSING_SYSTEM_PROMPT,
+    RATE_LIMIT_MAX_RETRIES,
+    DEFAULT_PROVIDER,
+    CIRCUIT_SLOW_CALL_SECONDS,
+    FAILOVER_LATENCY_BUDGET_SECONDS,
 )
 
+
+def get_system_prompt(member_id: str) -> str:
+    """Determine the system prompt for a council member ID."""
+    if member_id == CHAIRMAN_ID:
+        return CHAIRMAN_SYSTEM_PROMPT
+    if member_id in COUNCIL_ROLES:
+        return NURSING_SYSTEM_PROMPT + "\n\n" + COUNCIL_ROLES[member_id]
+    # Fallback or custom role passed as ID? 
+    # Actually custom roles are handled separately usually, but if member_id is standard...
+    return NURSING_SYSTEM_PROMPT
+
+
+def _resolve_config(llm_config: Optional[Dict[str, str]]) -> Tuple[str, str, str]:
+    """Read (provider, model, api_key), defaulting to azure/env vars (backward compatibility)."""
+    provider = llm_config.get("provider", DEFAULT_PROVIDER) if llm_config else DEFAULT_PROVIDER
+    model = llm_config.get("model", "gpt-4o") if llm_config else "gpt-4o"
+    api_key = llm_config.get("api_key", "") if llm_config else ""
+    return provider, model, api_key
+
+
+def _cache_bypassed(llm_config: Optional[Dict[str, Any]]) -> bool:
+    """Whether the request asked to skip cached responses (X-Cache-Bypass)."""
+    return bool(llm_config and llm_config.get("cache_bypass"))
+
+
+def _pause_after_rate_limit(limiter, error: Exception, attempt: int):
+    """Pause the deployment for Retry-After (or an exponential default) before re-queueing."""
+    delay = retry_after_seconds(error)
+    if delay is None:
+        delay = min(2 ** attempt, 30)
+    print(f"[RateLimit] 429 from {limiter.name}, retrying in {delay:.1f}s")
+    limiter.pause(delay)
+
+
+def _cache_key(
+    provider: str,
+    model: str,
+    api_key: str,
+    full_messages: List[Dict[str, str]],
+    params: Optional[Dict[str, Any]] = None
+) -> str:
+    """Response cache (and single-flight) key for a call, scoped to the caller's key."""
+    return llm_cache.make_cache_key(
+        provider, model, full_messages, api_key, **(params or {})
+    )
+
+
+def _cacheable(content: str, finish_reason: Optional[str], params: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Whether a response is worth replaying from the cache. One cut off by
+    max_tokens, or a json-mode answer that is not valid JSON, would come
+    back just as unusable on the retry meant to replace it.
+    """
+    if finish_reason == "length":
+        return False
+    if (params or {}).get("response_format"):
+        # Some providers wrap JSON in a markdown fence despite response_format
+        fenced = re.match(r'^```(?:json)?\s*(.*?)\s*```$', content.strip(), re.DOTALL)
+        try:
+            json.loads(fenced.group(1) if fenced else content)
+        except ValueError:
+            return False
+    return True
+
+
+def _remaining(deadline: float) -> float:
+    """Seconds left before a monotonic deadline."""
+    return deadline - time.monotonic()
+
+
+def _record_failure(breaker, error: BaseException, latency: float):
+    """Feed a failed call into the circuit breaker, ignoring errors that are not about provider health."""
+    if isinstance(error, asyncio.CancelledError):
+        # Deadline expiry or a hedged loser; only a slow call says anything about health
+        if latency >= CIRCUIT_SLOW_CALL_SECONDS:
+            breaker.record(False, latency)
+        else:
+            breaker.release()
+    elif isinstance(error, Exception) and is_retryable(error):
+        breaker.record(False, latency)
+    else:
+        breaker.release()
+
+
+def _route(provider: str, model: str, api_key: str, member_key: str) -> Dict[str, Any]:
+    """
+    Decide where one attempt is sent: deployment, credentials, limiter and breaker.
+
+    Azure calls are balanced across the endpoint pool, with quota and
+    circuit tracked per endpoint; every route must be closed with _end_route.
+    """
+    if provider != "azure":
+        return {
+            "target": None,
+            "model": model,
+            "api_key": api_key,
+            "api_base": None,
+            "api_version": None,
+            "limiter": get_rate_limiter(provider, model),
+            "breaker": get_circuit_breaker(provider, model),
+        }
+
+    target, deployment = azure_router.acquire(member_key)
+    return {
+        "target": target,
+        "model": deployment,
+        "api_key": target.api_key or api_key,
+        "api_base": target.endpoint,
+        "api_version": target.api_version,
+        "limiter": get_rate_limiter("azure", f"{target.name}/{deployment}", target.limits),
+        "breaker": target.breaker,
+    }
+
+
+def _end_route(route: Dict[str, Any], latency: Optional[float] = None):
+    """Close a route; `latency` is given for successful calls."""
+    if route["target"] is not None:
+        azure_router.release(route["target"], latency)
+
+
+async def _rate_limited_call(
+    full_messages: List[Dict[str, str]],
+    provider: str,
+    model: str,
+    api_key: str,
+    member_key: str,
+    deadline: float,
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Call LLMService through the deployment's rate limiter.
+
+    Each attempt is routed separately (see _route), so a re-queued or
+    hedged Azure call can land on another endpoint. The call fails fast
+    with CircuitOpenError if the deployment's circuit is open. Otherwise it
+    waits for request and token budget before it is sent. If the provider
+    still answers 429, the deployment is paused for Retry-After and the
+    call is re-queued rather than failed.
+
+    Returns the LLMService result: 'content', 'prompt_tokens', 'completion_tokens'.
+    """
+    tokens = estimate_tokens(full_messages, (params or {}).get("max_tokens"))
+
+    for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+        route = _route(provider, model, api_key, member_key)
+        breaker = route["breaker"]
+        latency = None
+        try:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {breaker.name}")
+            try:
+                await route["limiter"].acquire(tokens)
+            except BaseException:
+                # Cancelled or timed out in the queue: nothing reached the
+                # provider, but a half-open probe claimed by allow() must be freed
+                breaker.release()
+                raise
+            started_at = time.monotonic()
+            try:
+                result = await LLMService.agenerate_response(
+                    messages=full_messages,
+                    provider=provider,
+                    model=route["model"],
+                    api_key=route["api_key"],
+                    timeout=max(_remaining(deadline), 0.1),
+                    api_base=route["api_base"],
+                    api_version=route["api_version"],
+                    params=params
+                )
+            except litellm.RateLimitError as e:
+                # The provider is up, just busy: not a health signal
+                breaker.release()
+                if attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise
+                _pause_after_rate_limit(route["limiter"], e, attempt)
+                continue
+            except BaseException as e:
+                _record_failure(breaker, e, time.monotonic() - started_at)
+                raise
+            latency = time.monotonic() - started_at
+            breaker.record(True, latency)
+            return result
+        finally:
+            _end_route(route, latency)
+
+
+async def _generate_on(
+    full_messages: List[Dict[str, str]],
+    provider: str,
+    model: str,
+    api_key: str,
+    member_key: str,
+    timeout: float,
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Call one backend with retries and optional hedging.
+
+    Each attempt is hedged against the member's recent p95 latency, and
+    retryable failures are retried with jittered backoff. `timeout` bounds
+    the whole call, including queueing and retries: the provider gets the
+    time that is left, and asyncio.TimeoutError is raised when it runs out.
+    """
+    latency_key = f"{provider}/{model}/{member_key}"
+    deadline = time.monotonic() + timeout
+
+    async def attempt():
+        return await with_hedging(
+            lambda: _rate_limited_call(full_messages, provider, model, api_key, member_key, deadline, params),
+            latency_key
+        )
+
+    return await asyncio.wait_for(with_retries(attempt, latency_key), timeout)
+
+
+# In-flight calls by cache key, joined by identical concurrent calls
+_inflight: Dict[str, "asyncio.Future"] = {}
+# Callers still waiting on each in-flight call
+_flight_waiters: Dict["asyncio.Future", int] = {}
+_singleflight_stats = {"leaders": 0, "joined": 0}
+
+
+async def _generate(
+    full_messages: List[Dict[str, str]],
+    provider: str,
+    model: str,
+    api_key: str,
+    member_key: str,
+    timeout: float,
+    cache_bypass: bool = False,
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Generate a response through the cache and the member's failover chain.
+
+    Cached responses are returned without touching the provider. On a miss,
+    identical calls already in flight (same provider, model and messages,
+    e.g. from a double-submitted council) are joined instead of repeated;
+    otherwise the call goes down the failover chain (see _generate_fresh).
+    Responses from the cache or a joined call report zero token usage.
+
+    Args:
+        full_messages: Messages including the system prompt
+        provider: LLM provider name
+        model: Model or deployment name
+        api_key: Provider API key (empty for env-configured Azure)
+        member_key: Member ID used to pick the chain and track latency for hedging
+        timeout: Total seconds allowed for the call
+        cache_bypass: Skip the cache lookup (the fresh response is still stored)
+        params: Extra generation arguments (max_tokens, response_format, ...)
+
+    Returns:
+        {"content", "backend": provider that served it, "usage": usage.call_usage record}
+    """
+    started_at = time.monotonic()
+    cache_key = _cache_key(provider, model, api_key, full_messages, params)
+    if not cache_bypass:
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            return {
+                "content": cached,
+                "backend": provider,
+                "usage": call_usage(provider, model, 0, 0, time.monotonic() - started_at, cached=True),
+            }
+
+    flight = _inflight.get(cache_key)
+    if flight is None:
+        _singleflight_stats["leaders"] += 1
+        flight = asyncio.ensure_future(
+            _generate_fresh(full_messages, provider, model, api_key, member_key, timeout, cache_key, params)
+        )
+        _inflight[cache_key] = flight
+        flight.add_done_callback(lambda done: _end_flight(cache_key, done))
+        return await _await_flight(flight, timeout)
+
+    _singleflight_stats["joined"] += 1
+    result = await _await_flight(flight, timeout)
+    return {
+        **result,
+        "usage": call_usage(provider, model, 0, 0, time.monotonic() - started_at, cached=True),
+    }
+
+
+async def _await_flight(flight: "asyncio.Future", timeout: float) -> Dict[str, Any]:
+    """
+    Wait for a shared call. It is shielded, so a caller that gives up does
+    not cancel it for the others; the last caller to give up cancels it.
+    """
+    _flight_waiters[flight] = _flight_waiters.get(flight, 0) + 1
+    try:
+        return await asyncio.wait_for(asyncio.shield(flight), timeout)
+    finally:
+        _flight_waiters[flight] -= 1
+        if not _flight_waiters[flight]:
+            del _flight_waiters[flight]
+            if not flight.done():
+                flight.cancel()
+
+
+def _end_flight(cache_key: str, flight: "asyncio.Future"):
+    """Forget a finished in-flight call; mark its error retrieved if nobody waited for it."""
+    if _inflight.get(cache_key) is flight:
+        del _inflight[cache_key]
+    if not flight.cancelled():
+        flight.exception()
+
+
+async def _generate_fresh(
+    full_messages: List[Dict[str, str]],
+    provider: str,
+    model: str,
+    api_key: str,
+    member_key: str,
+    timeout: float,
+    cache_key: str,
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Call the member's backends in failover-chain order and cache the response.
+
+    A backend over its error budget is skipped (see failover.backend_chain),
+    and one that fails or outlives FAILOVER_LATENCY_BUDGET_SECONDS hands the
+    call to the next. The last backend gets whatever is left of `timeout`.
+    The response is cached under the backend that served it, unless it is
+    not worth replaying (see _cacheable).
+    """
+    started_at = time.monotonic()
+    deadline = started_at + timeout
+    chain = failover.backend_chain(member_key, provider, model, api_key)
+    for i, backend in enumerate(chain):
+        is_last = i == len(chain) - 1
+        if not is_last and failover.over_budget(backend["provider"], backend["model"]):
+            failover.record_failover(member_key, backend, chain[i + 1], "over budget")
+            continue
+
+        budget = _remaining(deadline)
+        if not is_last:
+            budget = min(budget, FAILOVER_LATENCY_BUDGET_SECONDS)
+        try:
+            result = await _generate_on(
+                full_messages, backend["provider"], backend["model"], backend["api_key"], member_key, budget, params
+            )
+        except Exception as e:
+            if is_last:
+                raise
+            failover.record_failover(member_key, backend, chain[i + 1], type(e).__name__)
+            continue
+
+        if backend["provider"] != provider or backend["model"] != model:
+            cache_key = _cache_key(backend["provider"], backend["model"], backend["api_key"], full_messages, params)
+        if _cacheable(result["content"] or "", result.get("finish_reason"), params):
+            await llm_cache.put(cache_key, result["content"])
+        return {
+            "content": result["content"],
+            "backend": backend["provider"],
+            "usage": call_usage(
+                backend["provider"], backend["model"],
+                result["prompt_tokens"], result["completion_tokens"],
+                time.monotonic() - started_at
+            ),
+        }
+
+
+def get_singleflight_stats() -> Dict[str, int]:
+    """Calls that went to a provider vs. calls that joined one already in flight."""
+    return {**_singleflight_stats, "in_flight": len(_inflight)}
+
+
 async def query_model(
     member_id: str,
     messages: List[Dict[str, str]],
     llm_config: Optional[Dict[str, str]] = None,
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    params: Optional[Dict[str, Any]] = None,
+    system_prompt: Optional[str] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Query a model for a specific council member using the unified service.
@@ -26,64 +411,220 @@ async def query_model(
         messages: List of message dicts
         llm_config: Dict containing 'provider', 'model', 'api_key'
         timeout: Request timeout
+        params: Extra generation arguments passed to the provider
+            (max_tokens, temperature, stop, seed, response_format, ...)
+        system_prompt: Replaces the member's own system prompt (e.g. for
+            the chairman acting as stage 2 judge)
 
     Returns:
-        Response dict with 'content', or None if failed
+        Response dict with 'content', the 'backend' that served it and its
+        'usage' (tokens, latency, cost), or None if failed
     """
-    # Default to azure/env vars if no config provided (backward compatibility)
-    provider = llm_config.get("provider", "azure") if llm_config else "azure"
-    model = llm_config.get("model", "gpt-4o") if llm_config else "gpt-4o"
-    api_key = llm_config.get("api_key", "") if llm_config else ""
-
-    # Determine system prompt based on member ID
-    if member_id == CHAIRMAN_ID:
-        system_prompt = CHAIRMAN_SYSTEM_PROMPT
-    elif member_id in COUNCIL_ROLES:
-        system_prompt = NURSING_SYSTEM_PROMPT + "\n\n" + COUNCIL_ROLES[member_id]
-    else:
-        # Fallback or custom role passed as ID? 
-        # Actually custom roles are handled separately usually, but if member_id is standard...
-        system_prompt = NURSING_SYSTEM_PROMPT
+    provider, model, api_key = _resolve_config(llm_config)
 
     # Prepend system prompt to messages
-    full_messages = [{"role": "system", "content": system_prompt}] + messages
+    full_messages = [{"role": "system", "content": system_prompt or get_system_prompt(member_id)}] + messages
 
     try:
-        content = LLMService.generate_response(
-            messages=full_messages,
-            provider=provider,
-            model=model,
-            api_key=api_key
+        return await _generate(
+            full_messages, provider, model, api_key, member_id, timeout,
+            cache_bypass=_cache_bypassed(llm_config), params=params
         )
-        return {"content": content}
+    except asyncio.TimeoutError:
+        print(f"Timed out querying {member_id} ({provider}/{model}) after {timeout:.1f}s")
+        return None
+    except CircuitOpenError as e:
+        print(f"Skipping {member_id}: {e}")
+        return None
     except Exception as e:
         print(f"Error querying {member_id} ({provider}/{model}): {e}")
         return None
 
 
+async def _stream_on(
+    full_messages: List[Dict[str, str]],
+    provider: str,
+    model: str,
+    api_key: str,
+    member_id: str,
+    deadline: float,
+    first_chunk_deadline: float,
+    tokens_used: Dict[str, int],
+    params: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[str]:
+    """
+    Stream from one backend, re-queueing on 429 until the first chunk.
+
+    asyncio.TimeoutError is raised if no chunk arrives by
+    `first_chunk_deadline` or the stream outlives `deadline`. The complete
+    text is cached under this backend's key (unless cut off by max_tokens),
+    and `tokens_used` is filled with the call's prompt and completion
+    tokens and finish reason.
+    """
+    cache_key = _cache_key(provider, model, api_key, full_messages, params)
+    tokens = estimate_tokens(full_messages, (params or {}).get("max_tokens"))
+
+    for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+        route = _route(provider, model, api_key, member_id)
+        breaker = route["breaker"]
+        latency = None
+        stream = None
+        try:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {breaker.name}")
+            try:
+                await asyncio.wait_for(route["limiter"].acquire(tokens), max(_remaining(first_chunk_deadline), 0))
+            except BaseException:
+                breaker.release()
+                raise
+            started_at = time.monotonic()
+            started = False
+            stream = LLMService.astream_response(
+                messages=full_messages,
+                provider=provider,
+                model=route["model"],
+                api_key=route["api_key"],
+                timeout=max(_remaining(deadline), 0.1),
+                api_base=route["api_base"],
+                api_version=route["api_version"],
+                params=params,
+                usage=tokens_used
+            )
+            chunks = []
+            try:
+                while True:
+                    wait_until = deadline if started else first_chunk_deadline
+                    try:
+                        delta = await asyncio.wait_for(stream.__anext__(), max(_remaining(wait_until), 0))
+                    except StopAsyncIteration:
+                        latency = time.monotonic() - started_at
+                        breaker.record(True, latency)
+                        text = "".join(chunks)
+                        if _cacheable(text, tokens_used.get("finish_reason"), params):
+                            await llm_cache.put(cache_key, text)
+                        return
+                    started = True
+                    chunks.append(delta)
+                    yield delta
+            except litellm.RateLimitError as e:
+                breaker.release()
+                # Only safe to re-queue if nothing has been yielded yet
+                if started or attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise
+                _pause_after_rate_limit(route["limiter"], e, attempt)
+            except BaseException as e:
+                _record_failure(breaker, e, time.monotonic() - started_at)
+                raise
+        finally:
+            if stream is not None:
+                await stream.aclose()
+            _end_route(route, latency)
+
+
+async def query_model_stream(
+    member_id: str,
+    messages: List[Dict[str, str]],
+    llm_config: Optional[Dict[str, str]] = None,
+    timeout: float = 120.0,
+    served: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[str]:
+    """
+    Stream a council member's response as incremental text chunks.
+
+    Backends are tried in failover-chain order until one produces a first
+    chunk; once text has been yielded the stream is never switched.
+
+    Args:
+        member_id: Council member ID or 'chairman'
+        messages: List of message dicts
+        llm_config: Dict containing 'provider', 'model', 'api_key'
+        timeout: Request timeout
+        served: Optional dict; its 'backend' key is set to the provider
+            that served the stream before the first chunk is yielded, and
+            'usage' once the stream is complete
+        params: Optional generation arguments (max_tokens, temperature, ...)
+
+    Yields:
+        Text deltas; errors (including asyncio.TimeoutError once `timeout`
+        has elapsed) are raised to the caller
+    """
+    provider, model, api_key = _resolve_config(llm_config)
+
+    full_messages = [{"role": "system", "content": get_system_prompt(member_id)}] + messages
+    if served is None:
+        served = {}
+    started_at = time.monotonic()
+
+    # A cached response is replayed as a single delta
+    if not _cache_bypassed(llm_config):
+        cache_key = _cache_key(provider, model, api_key, full_messages, params)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            served["backend"] = provider
+            served["usage"] = call_usage(provider, model, 0, 0, time.monotonic() - started_at, cached=True)
+            yield cached
+            return
+
+    deadline = started_at + timeout
+    chain = failover.backend_chain(member_id, provider, model, api_key)
+    for i, backend in enumerate(chain):
+        is_last = i == len(chain) - 1
+        if not is_last and failover.over_budget(backend["provider"], backend["model"]):
+            failover.record_failover(member_id, backend, chain[i + 1], "over budget")
+            continue
+
+        first_chunk_deadline = deadline
+        if not is_last:
+            first_chunk_deadline = min(deadline, time.monotonic() + FAILOVER_LATENCY_BUDGET_SECONDS)
+        tokens_used = {}
+        stream = _stream_on(
+            full_messages, backend["provider"], backend["model"], backend["api_key"],
+            member_id, deadline, first_chunk_deadline, tokens_used, params
+        )
+        started = False
+        try:
+            async for delta in stream:
+                if not started:
+                    served["backend"] = backend["provider"]
+                started = True
+                yield delta
+            served["usage"] = call_usage(
+                backend["provider"], backend["model"],
+                tokens_used.get("prompt_tokens", 0), tokens_used.get("completion_tokens", 0),
+                time.monotonic() - started_at
+            )
+            return
+        except Exception as e:
+            if started or is_last:
+                raise
+            failover.record_failover(member_id, backend, chain[i + 1], type(e).__name__)
+        finally:
+            await stream.aclose()
+
+
 async def query_model_with_custom_prompt(
     messages: List[Dict[str, str]],
     system_prompt: str,
     llm_config: Optional[Dict[str, str]] = None,
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    params: Optional[Dict[str, Any]] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Query a model using a custom system prompt (for custom roles).
     """
-    provider = llm_config.get("provider", "azure") if llm_config else "azure"
-    model = llm_config.get("model", "gpt-4o") if llm_config else "gpt-4o"
-    api_key = llm_config.get("api_key", "") if llm_config else ""
+    provider, model, api_key = _resolve_config(llm_config)
 
     full_messages = [{"role": "system", "content": system_prompt}] + messages
 
     try:
-        content = LLMService.generate_response(
-            messages=full_messages,
-            provider=provider,
-            model=model,
-            api_key=api_key
+        return await _generate(
+            full_messages, provider, model, api_key, "custom", timeout,
+            cache_bypass=_cache_bypassed(llm_config), params=params
         )
-        return {"content": content}
+    except asyncio.TimeoutError:
+        print(f"Timed out querying custom role ({provider}/{model}) after {timeout:.1f}s")
+        return None
     except Exception as e:
         print(f"Error querying custom role ({provider}/{model}): {e}")
         return None
@@ -102,6 +643,81 @@ async def query_models_parallel(
     return {m: response for m, response in zip(member_ids, responses)}
 
 
+async def iter_as_completed(
+    awaitables: List[Awaitable[Any]],
+    max_concurrency: Optional[int] = None,
+    quorum: Optional[int] = None,
+    wait_seconds: Optional[float] = None,
+    on_late: Optional[Callable[[int, Any], None]] = None
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Run awaitables concurrently and yield (index, result) as each finishes.
+
+    Results that finish together are yielded in index order. Anything still
+    pending when the consumer stops iterating (or fails, or is cancelled)
+    is cancelled.
+
+    Iteration can also end early: once `quorum` results other than None
+    have been yielded, or once `wait_seconds` have passed and a majority
+    of the awaitables (or `quorum`, if smaller) has. Stragglers are then
+    cancelled or, if `on_late` is given, left to finish, with
+    on_late(index, result) called for each that succeeds.
+
+    Args:
+        awaitables: Coroutines to run
+        max_concurrency: Optional cap on how many run at once
+        quorum: Optional number of answers after which to stop waiting
+        wait_seconds: Optional time after which a majority is enough
+        on_late: Optional callback for stragglers that finish later
+    """
+    if max_concurrency:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(awaitable):
+            async with semaphore:
+                return await awaitable
+
+        awaitables = [bounded(a) for a in awaitables]
+
+    tasks = [asyncio.ensure_future(a) for a in awaitables]
+    index_of = {task: i for i, task in enumerate(tasks)}
+    pending = set(tasks)
+    soft_deadline = time.monotonic() + wait_seconds if wait_seconds else None
+    # Past the soft deadline, still wait for a majority rather than the first answer
+    majority = len(tasks) // 2 + 1
+    soft_minimum = min(quorum, majority) if quorum else majority
+    answered = 0
+    moved_on = False
+    try:
+        while pending:
+            if quorum and answered >= quorum:
+                moved_on = True
+                break
+            timeout = None
+            if soft_deadline is not None and answered >= soft_minimum:
+                timeout = max(soft_deadline - time.monotonic(), 0)
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                moved_on = True
+                break
+            for task in sorted(done, key=index_of.get):
+                result = task.result()
+                if result is not None:
+                    answered += 1
+                yield index_of[task], result
+    finally:
+        # Only stragglers of a met quorum are left to finish; a consumer that
+        # gave up (client disconnect, error) takes every pending call with it
+        for task in pending:
+            if on_late is None or not moved_on:
+                task.cancel()
+            else:
+                task.add_done_callback(
+                    lambda t: on_late(index_of[t], t.result())
+                    if not t.cancelled() and t.exception() is None and t.result() is not None else None
+                )
+
+
 def get_council_members() -> List[str]:
     """Get list of standard council member IDs."""
     return COUNCIL_MEMBERS
@@ -0,0 +1,73 @@
+"""Offline load test for the council pipeline using the mock provider.
+
+Runs many full councils concurrently against the mock LLM provider and
+reports throughput and end-to-end latency percentiles. Latency
+distributions, error rates and 429 injection are configured through the
+MOCK_LLM_* environment variables (see .env.example).
+
+Usage:
+    python -m backend.loadtest --runs 50 --concurrency 10
+    MOCK_LLM_LATENCY_DIST=pareto MOCK_LLM_ERROR_RATE=0.05 python -m backend.loadtest
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, Any, List
+
+from .council import run_full_council
+from .main import metrics
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_load(runs: int, concurrency: int) -> Dict[str, Any]:
+    """Run `runs` councils with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    llm_config = {"provider": "mock", "model": "mock-gpt", "api_key": "", "cache_bypass": True}
+    latencies = []
+    failures = 0
+
+    async def one(i: int):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                # Vary the query so runs are not identical prompts
+                await run_full_council(f"Review lesson plan #{i} on sepsis recognition.", llm_config=llm_config)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                failures += 1
+                print(f"Run {i} failed: {e}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(runs)])
+    elapsed = time.perf_counter() - start
+
+    return {"elapsed": elapsed, "latencies": latencies, "failures": failures}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the council against the mock LLM provider.")
+    parser.add_argument("--runs", type=int, default=50, help="Total council runs")
+    parser.add_argument("--concurrency", type=int, default=10, help="Council runs in flight at once")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load(args.runs, args.concurrency))
+    latencies = result["latencies"]
+
+    print(f"Runs: {args.runs} (concurrency {args.concurrency}), failures: {result['failures']}")
+    print(f"Elapsed: {result['elapsed']:.2f}s, throughput: {len(latencies) / result['elapsed']:.2f} councils/s")
+    if latencies:
+        for pct in (50, 95, 99):
+            print(f"p{pct}: {percentile(latencies, pct):.2f}s")
+        print(f"max: {max(latencies):.2f}s")
+    print(f"Metrics: {asyncio.run(metrics())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,60 @@
 """FastAPI backend for LLM Council."""
 
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import uuid
 import json
 import asyncio
 
 from . import storage
-from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
+from . import http_clients
+from . import rate_limiter
+from . import resilience
+from . import llm_cache
+from . import circuit_breaker
+from . import azure_router
+from . import failover
+from . import usage
+from .llm_client import get_singleflight_stats
+from .config import (
+    DEFAULT_PROVIDER,
+    CHAIRMAN_SPECULATIVE,
+    COUNCIL_TIERS,
+    COUNCIL_DEFAULT_TIER,
+)
+from .council import (
+    run_full_council,
+    generate_conversation_title,
+    stage1_iter_responses,
+    order_stage1_results,
+    prepare_rankings,
+    stage2_iter_rankings,
+    stage3_synthesize_final_stream,
+    calculate_aggregate_rankings,
+    get_quorum_stats,
+    start_chairman_draft,
+    tier_stage_weights,
+    tier_extra_rankers,
+    CouncilDeadline,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared HTTP clients at startup and close them at shutdown."""
+    await http_clients.startup()
+    yield
+    await http_clients.shutdown()
 
-app = FastAPI(title="Nursing Council Agent API")
+
+app = FastAPI(title="Nursing Council Agent API", lifespan=lifespan)
 
 # Enable CORS for local development, GitHub Codespaces, and Azure Container Apps
 app.add_middleware(
@@ -49,6 +88,10 @@ class SendMessageRequest(BaseModel):
     """Request to send a message in a conversation."""
     content: str
     custom_roles: List[CustomRole] = []
+    # Rank with one judge call (STAGE2_JUDGE_MEMBER) instead of peer review
+    judge_ranking: bool = False
+    # Latency tier (fast, standard or thorough); overrides X-Council-Tier
+    tier: Optional[str] = None
 
 
 class ConversationMetadata(BaseModel):
@@ -67,10 +110,63 @@ class Conversation(BaseModel):
     messages: List[Dict[str, Any]]
 
 
+def build_llm_config(
+    x_provider: Optional[str],
+    x_model: Optional[str],
+    x_api_key: Optional[str],
+    x_cache_bypass: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the per-request LLM config from BYOK headers or defaults."""
+    return {
+        "provider": x_provider or DEFAULT_PROVIDER,
+        "model": x_model or "gpt-4o",
+        "api_key": x_api_key or "",
+        "cache_bypass": (x_cache_bypass or "").lower() in ("1", "true", "yes"),
+    }
+
+
+def resolve_tier(body_tier: Optional[str], x_council_tier: Optional[str]) -> str:
+    """Latency tier of a request: the body field, else the header, else COUNCIL_DEFAULT_TIER."""
+    tier = (body_tier or x_council_tier or COUNCIL_DEFAULT_TIER).lower()
+    if tier not in COUNCIL_TIERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown council tier '{tier}', expected one of {', '.join(COUNCIL_TIERS)}"
+        )
+    return tier
+
+
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "ok", "service": "Nursing Council Agent API"}
+    """
+    Health check endpoint.
+
+    Reports 'degraded' while any LLM deployment's circuit is not closed,
+    along with each circuit's state and recent latency percentiles.
+    """
+    circuits = circuit_breaker.get_circuit_states()
+    degraded = any(c["state"] != circuit_breaker.CLOSED for c in circuits.values())
+    return {
+        "status": "degraded" if degraded else "ok",
+        "service": "Nursing Council Agent API",
+        "circuits": circuits,
+    }
+
+
+@app.get("/api/metrics")
+async def metrics():
+    """Runtime metrics for the LLM backends."""
+    return {
+        "http": http_clients.get_connection_stats(),
+        "rate_limits": rate_limiter.get_bucket_levels(),
+        "resilience": resilience.get_resilience_stats(),
+        "cache": llm_cache.get_cache_stats(),
+        "azure_targets": azure_router.get_router_stats(),
+        "failover": failover.get_failover_stats(),
+        "usage": usage.get_usage_stats(),
+        "singleflight": get_singleflight_stats(),
+        "quorum": get_quorum_stats(),
+    }
 
 
 @app.get("/api/conversations", response_model=List[ConversationMetadata])
@@ -102,18 +198,17 @@ async def send_message(
     request: SendMessageRequest,
     x_provider: str = Header(None, alias="X-Provider"),
     x_model: str = Header(None, alias="X-Model"),
-    x_api_key: str = Header(None, alias="X-API-Key")
+    x_api_key: str = Header(None, alias="X-API-Key"),
+    x_cache_bypass: str = Header(None, alias="X-Cache-Bypass"),
+    x_council_tier: str = Header(None, alias="X-Council-Tier")
 ):
     """
     Send a message and run the 3-stage council process.
     Returns the complete response with all stages.
     """
     # Build LLM config from headers or defaults
-    llm_config = {
-        "provider": x_provider or "azure",
-        "model": x_model or "gpt-4o",
-        "api_key": x_api_key or ""
-    }
+    llm_config = build_llm_config(x_provider, x_model, x_api_key, x_cache_bypass)
+    tier = resolve_tier(request.tier, x_council_tier)
 
     # Check if conversation exists
     conversation = storage.get_conversation(conversation_id)
@@ -129,8 +224,9 @@ async def send_message(
     # If this is the first message, generate a title
     if is_first_message:
         try:
-            title = await generate_conversation_title(request.content, llm_config)
-            storage.update_conversation_title(conversation_id, title)
+            title_call = {}
+            title = await generate_conversation_title(request.content, llm_config, title_call)
+            storage.update_conversation_title(conversation_id, title, usage=title_call.get("usage"))
         except Exception:
             # Non-critical, ignore logic error in title gen
             pass
@@ -143,7 +239,9 @@ async def send_message(
         stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
             request.content,
             custom_roles=custom_roles_dicts,
-            llm_config=llm_config
+            llm_config=llm_config,
+            judge_ranking=request.judge_ranking,
+            tier=tier
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -153,7 +251,8 @@ async def send_message(
         conversation_id,
         stage1_results,
         stage2_results,
-        stage3_result
+        stage3_result,
+        usage=metadata["usage"]
     )
 
     # Return the complete response with metadata
@@ -171,18 +270,17 @@ async def send_message_stream(
     request: SendMessageRequest,
     x_provider: str = Header(None, alias="X-Provider"),
     x_model: str = Header(None, alias="X-Model"),
-    x_api_key: str = Header(None, alias="X-API-Key")
+    x_api_key: str = Header(None, alias="X-API-Key"),
+    x_cache_bypass: str = Header(None, alias="X-Cache-Bypass"),
+    x_council_tier: str = Header(None, alias="X-Council-Tier")
 ):
     """
     Send a message and stream the 3-stage council process.
     Returns Server-Sent Events as each stage completes.
     """
     # Build LLM config
-    llm_config = {
-        "provider": x_provider or "azure",
-        "model": x_model or "gpt-4o",
-        "api_key": x_api_key or ""
-    }
+    llm_config = build_llm_config(x_provider, x_model, x_api_key, x_cache_bypass)
+    tier = resolve_tier(request.tier, x_council_tier)
 
     # Check if conversation exists
     conversation = storage.get_conversation(conversation_id)
@@ -193,56 +291,97 @@ async def send_message_stream(
     is_first_message = len(conversation["messages"]) == 0
 
     async def event_generator():
+        draft = None
         try:
             # Add user message
             storage.add_user_message(conversation_id, request.content)
 
             # Start title generation in parallel (don't await yet)
             title_task = None
+            title_call = {}
             if is_first_message:
-                title_task = asyncio.create_task(generate_conversation_title(request.content, llm_config))
+                title_task = asyncio.create_task(generate_conversation_title(request.content, llm_config, title_call))
+
+            # One latency budget for the whole run, shared across the stages
+            deadline = CouncilDeadline(weights=tier_stage_weights(tier))
 
             # Stage 1: Collect responses
             yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
             # Convert custom_roles to dict format for council
             custom_roles_dicts = [r.model_dump() for r in request.custom_roles] if request.custom_roles else None
-            stage1_results = await stage1_collect_responses(request.content, custom_roles_dicts, llm_config)
+            stage1_by_index = {}
+            late_arrivals = []
+            async for index, result in stage1_iter_responses(request.content, custom_roles_dicts, llm_config, deadline.stage_timeout(1), late_arrivals):
+                stage1_by_index[index] = result
+                yield f"data: {json.dumps({'type': 'stage1_member_complete', 'data': result})}\n\n"
+            stage1_results = order_stage1_results(stage1_by_index, llm_config)
             yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
 
-            # Stage 2: Collect rankings
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
-            stage2_results, label_to_model = await stage2_collect_rankings(request.content, stage1_results, llm_config)
-            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
-
-            # Stage 3: Synthesize final answer
+            # Speculative chairman draft, overlapping stage 2
+            if CHAIRMAN_SPECULATIVE and tier == "standard":
+                draft = start_chairman_draft(request.content, stage1_results, llm_config, deadline.remaining())
+
+            # Stage 2: Collect rankings (the fast tier goes straight to the chairman)
+            stage2_results, label_to_model, aggregate_rankings = [], {}, []
+            stage2_metadata, digest_calls = {}, []
+            if tier != "fast":
+                yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
+                ranking_plan = await prepare_rankings(
+                    request.content, stage1_results, llm_config, deadline.stage_timeout(2),
+                    request.judge_ranking and tier == "standard", tier_extra_rankers(tier)
+                )
+                label_to_model = ranking_plan["label_to_model"]
+                stage2_metadata, digest_calls = ranking_plan["metadata"], ranking_plan["calls"]
+                stage2_by_index = {}
+                async for index, result in stage2_iter_rankings(ranking_plan["assignments"], llm_config, ranking_plan["timeout"], late_arrivals=late_arrivals):
+                    stage2_by_index[index] = result
+                    yield f"data: {json.dumps({'type': 'stage2_member_complete', 'data': result})}\n\n"
+                stage2_results = [stage2_by_index[i] for i in sorted(stage2_by_index)]
+                aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+                yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings, **stage2_metadata}})}\n\n"
+
+            # Stage 3: Synthesize final answer, streaming the chairman's tokens
             yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
-            stage3_result = await stage3_synthesize_final(request.content, stage1_results, stage2_results, llm_config)
+            stage3_result = None
+            async for kind, payload in stage3_synthesize_final_stream(request.content, stage1_results, stage2_results, llm_config, deadline.stage_timeout(3), draft, aggregate_rankings):
+                if kind == "delta":
+                    yield f"data: {json.dumps({'type': 'stage3_delta', 'delta': payload})}\n\n"
+                else:
+                    stage3_result = payload
             yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
+            if stage3_result.get("truncated"):
+                yield f"data: {json.dumps({'type': 'error', 'message': 'The final synthesis was cut off before it finished. Please try again.'})}\n\n"
 
             # Wait for title generation if it was started
             if title_task:
                 try:
                     title = await title_task
-                    storage.update_conversation_title(conversation_id, title)
+                    storage.update_conversation_title(conversation_id, title, usage=title_call.get("usage"))
                     yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
                 except Exception:
                     pass
 
             # Save complete assistant message
+            run_usage = usage.summarize_run(stage1_results, stage2_results, stage3_result, {"stage2": digest_calls})
             storage.add_assistant_message(
                 conversation_id,
                 stage1_results,
                 stage2_results,
-                stage3_result
+                stage3_result,
+                usage=run_usage
             )
 
             # Send completion event
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+            yield f"data: {json.dumps({'type': 'complete', 'metadata': {'tier': tier, 'usage': run_usage, 'late_arrivals': late_arrivals, **stage2_metadata}})}\n\n"
 
         except Exception as e:
             # Send error event
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+        finally:
+            # Stage 2 failed or the client disconnected before stage 3 took
+            # the speculative draft: stop paying for it
+            if draft is not None:
+                draft.cancel()
 
     return StreamingResponse(
         event_generator(),
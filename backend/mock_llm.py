@@ -0,0 +1,208 @@
+"""Deterministic mock LLM provider for benchmarking and load testing.
+
+Selected with the "X-Provider: mock" header or API_BACKEND=mock. It never
+calls a real API, but returns text shaped like each stage's real output
+(stage 1 feedback, stage 2 evaluations ending in a valid FINAL RANKING:
+block or JSON rankings when a response_format is requested, chairman
+synthesis, titles) after a simulated latency. Error and
+429 injection exercise the retry, rate-limit and failover paths.
+
+Response text is derived from a hash of the messages, so the same prompt
+always gets the same answer. Latency and injected failures come from a
+seeded random generator (MOCK_LLM_SEED).
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from typing import List, Dict, Any, AsyncIterator
+
+import httpx
+import litellm
+
+from .config import (
+    CHAIRMAN_SYSTEM_PROMPT,
+    COUNCIL_ROLES,
+    MOCK_LLM_LATENCY_DIST,
+    MOCK_LLM_LATENCY_MEAN,
+    MOCK_LLM_LATENCY_STDDEV,
+    MOCK_LLM_ERROR_RATE,
+    MOCK_LLM_RATE_LIMIT_RATE,
+    MOCK_LLM_SEED,
+)
+
+_rng = random.Random(MOCK_LLM_SEED)
+
+ROLE_NAMES = {
+    "academic": "The Academic",
+    "clinical_mentor": "The Clinical Mentor",
+    "student_advocate": "The Student Advocate",
+}
+
+
+def sample_latency() -> float:
+    """
+    Draw a latency in seconds from the configured distribution.
+
+    fixed:      always MOCK_LLM_LATENCY_MEAN
+    normal:     normal(mean, stddev), clipped at zero
+    lognormal:  long-tailed, with the given mean and stddev
+    pareto:     heavy-tailed (alpha 2.5), scaled to the given mean
+    """
+    mean = MOCK_LLM_LATENCY_MEAN
+    stddev = MOCK_LLM_LATENCY_STDDEV
+    if MOCK_LLM_LATENCY_DIST == "normal":
+        return max(_rng.gauss(mean, stddev), 0.0)
+    if MOCK_LLM_LATENCY_DIST == "lognormal":
+        if mean <= 0:
+            return 0.0
+        sigma2 = math.log(1 + (stddev / mean) ** 2)
+        return _rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+    if MOCK_LLM_LATENCY_DIST == "pareto":
+        alpha = 2.5
+        return mean * (alpha - 1) / alpha * _rng.paretovariate(alpha)
+    return mean
+
+
+def _maybe_fail(model: str):
+    """Inject a 429 or a server error at the configured rates."""
+    roll = _rng.random()
+    if roll < MOCK_LLM_RATE_LIMIT_RATE:
+        response = httpx.Response(
+            429,
+            headers={"retry-after": "1"},
+            request=httpx.Request("POST", "https://mock.invalid/chat/completions"),
+        )
+        raise litellm.RateLimitError(
+            "Mock rate limit", llm_provider="mock", model=model, response=response
+        )
+    if roll < MOCK_LLM_RATE_LIMIT_RATE + MOCK_LLM_ERROR_RATE:
+        raise litellm.InternalServerError("Mock server error", llm_provider="mock", model=model)
+
+
+def _seed_for(messages: List[Dict[str, str]]) -> int:
+    digest = hashlib.sha256(repr(messages).encode("utf-8")).hexdigest()
+    return int(digest[:16], 16)
+
+
+def _role_name(system_prompt: str) -> str:
+    for member_id, role_prompt in COUNCIL_ROLES.items():
+        if role_prompt in system_prompt:
+            return ROLE_NAMES[member_id]
+    match = re.match(r"You are (.+?), a council member", system_prompt)
+    if match:
+        return match.group(1)
+    return "A council member"
+
+
+def _response_labels(prompt: str) -> List[str]:
+    return list(dict.fromkeys(re.findall(r"^(Response [A-Z]+):", prompt, re.MULTILINE)))
+
+
+def _ranking_json(prompt: str, rng: random.Random) -> str:
+    labels = _response_labels(prompt)
+    order = labels[:]
+    rng.shuffle(order)
+    evaluations = [
+        {
+            "label": label,
+            "score": 10 - min(position, 9),
+            "comment": rng.choice(["Well evidenced.", "Clinically realistic.", "Clear for students.", "Misses key NMC standards."]),
+        }
+        for position, label in enumerate(order)
+    ]
+    evaluations.sort(key=lambda e: e["label"])
+    return json.dumps({"evaluations": evaluations, "ranking": order})
+
+
+def _ranking_text(prompt: str, rng: random.Random) -> str:
+    labels = _response_labels(prompt)
+    order = labels[:]
+    rng.shuffle(order)
+    critiques = "\n".join(
+        f"{label} {rng.choice(['is well evidenced', 'is clinically realistic', 'is clear for students', 'misses key NMC standards'])}."
+        for label in labels
+    )
+    ranking = "\n".join(f"{i}. {label}" for i, label in enumerate(order, start=1))
+    return f"{critiques}\n\nFINAL RANKING:\n{ranking}"
+
+
+def build_response(messages: List[Dict[str, str]], **params: Any) -> str:
+    """Build stage-appropriate text for a request, deterministically."""
+    rng = random.Random(_seed_for(messages))
+    system_prompt = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+    prompt = messages[-1]["content"] if messages else ""
+
+    if prompt.startswith("Generate a very short title"):
+        return rng.choice(["Sepsis Teaching Review", "Medication Safety Lesson", "Care Planning Feedback"])
+
+    # Ranking prompts first: a judge or extra ranker may be the chairman
+    if _response_labels(prompt):
+        if params.get("response_format"):
+            return _ranking_json(prompt, rng)
+        if "FINAL RANKING:" in prompt:
+            return _ranking_text(prompt, rng)
+
+    if system_prompt == CHAIRMAN_SYSTEM_PROMPT:
+        emphasis = ""
+        if "EMPHASIS:" in prompt:
+            # Speculative draft: name the members it leaned on
+            models = re.findall(r"^Model: (.+)$", prompt, re.MULTILINE)
+            rng.shuffle(models)
+            emphasis = "\n\nEMPHASIS: " + ", ".join(models)
+        return (
+            "## Council Synthesis\n\n"
+            "**Consensus:** All members agree the content is relevant to NMC proficiencies.\n\n"
+            "**Tensions:** Academic rigour versus accessibility for first-year students.\n\n"
+            "**Recommendations:**\n"
+            "1. Add references to current NICE guidance.\n"
+            "2. Include a realistic ward scenario.\n"
+            "3. Simplify terminology and add a glossary."
+            + emphasis
+        )
+
+    role = _role_name(system_prompt)
+    strengths = rng.choice(["clear learning outcomes", "good use of case studies", "person-centred language"])
+    improvement = rng.choice(["more recent evidence", "scaffolded activities", "clinical realism"])
+    return (
+        f"**{role}'s review**\n\n"
+        f"What works well: {strengths}.\n\n"
+        f"What could be improved: {improvement}.\n\n"
+        f"Suggestion: revise the material with {improvement} in mind."
+    )
+
+
+def generate(messages: List[Dict[str, str]], model: str, **params: Any) -> str:
+    """Blocking mock completion."""
+    time.sleep(sample_latency())
+    _maybe_fail(model)
+    return build_response(messages, **params)
+
+
+async def agenerate(messages: List[Dict[str, str]], model: str, **params: Any) -> str:
+    """Async mock completion."""
+    await asyncio.sleep(sample_latency())
+    _maybe_fail(model)
+    return build_response(messages, **params)
+
+
+async def astream(messages: List[Dict[str, str]], model: str, **params: Any) -> AsyncIterator[str]:
+    """
+    Streaming mock completion.
+
+    A third of the sampled latency is spent before the first token, and
+    the rest is spread evenly across the words.
+    """
+    latency = sample_latency()
+    await asyncio.sleep(latency / 3)
+    _maybe_fail(model)
+
+    words = re.findall(r"\S+\s*", build_response(messages, **params))
+    per_word = (latency * 2 / 3) / max(len(words), 1)
+    for word in words:
+        await asyncio.sleep(per_word)
+        yield word
@@ -0,0 +1,183 @@
+"""Token-bucket rate limiting for LLM deployments.
+
+Every council call for a deployment draws from two buckets: one for
+requests per minute and one for tokens per minute. When either bucket is
+empty the call waits in a FIFO queue instead of being sent and rejected
+with a 429. A 429 that slips through anyway pauses the whole deployment
+for its Retry-After period.
+"""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Optional
+
+from .config import RATE_LIMITS, RATE_LIMIT_DEFAULT_COMPLETION_TOKENS
+
+
+class TokenBucket:
+    """A bucket of `capacity` units refilled evenly over one minute."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        # Never ask for more than a full bucket, or the call could wait forever
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_second
+
+    def consume(self, amount: float):
+        if self.unlimited:
+            return
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def snapshot(self) -> Optional[Dict[str, float]]:
+        if self.unlimited:
+            return None
+        self._refill()
+        return {"level": round(self.level, 1), "capacity": self.capacity}
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budgets for one deployment."""
+
+    def __init__(self, name: str, rpm: int = 0, tpm: int = 0):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.paused_until = 0.0
+        self.queued = 0
+        self.rate_limited = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0):
+        """
+        Wait until the deployment has budget for one request of `tokens` tokens.
+
+        Callers are served in arrival order, so one large request cannot be
+        starved by a stream of small ones.
+        """
+        self.queued += 1
+        try:
+            async with self._lock:
+                while True:
+                    wait = max(
+                        self.paused_until - time.monotonic(),
+                        self.requests.wait_time(1),
+                        self.tokens.wait_time(tokens),
+                    )
+                    if wait <= 0:
+                        self.requests.consume(1)
+                        self.tokens.consume(tokens)
+                        return
+                    await asyncio.sleep(wait)
+        finally:
+            self.queued -= 1
+
+    def pause(self, seconds: float):
+        """Stop sending requests for `seconds` (after a 429 with Retry-After)."""
+        self.rate_limited += 1
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests_per_minute": self.requests.snapshot(),
+            "tokens_per_minute": self.tokens.snapshot(),
+            "queued": self.queued,
+            "paused_for": round(max(self.paused_until - time.monotonic(), 0.0), 2),
+            "rate_limited": self.rate_limited,
+        }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(
+    provider: str,
+    model: str,
+    limits: Optional[Dict[str, int]] = None
+) -> RateLimiter:
+    """
+    Get the shared limiter for a provider deployment, creating it on first use.
+
+    `limits` ({"rpm", "tpm"}) overrides the provider-wide RATE_LIMITS, e.g.
+    for one Azure endpoint in a multi-region pool.
+    """
+    name = f"{provider}/{model}"
+    limiter = _limiters.get(name)
+    if limiter is None:
+        if limits is None:
+            limits = RATE_LIMITS.get(provider, {})
+        limiter = RateLimiter(name, rpm=limits.get("rpm", 0), tpm=limits.get("tpm", 0))
+        _limiters[name] = limiter
+    return limiter
+
+
+def estimate_tokens(messages: List[Dict[str, str]], completion_tokens: Optional[int] = None) -> int:
+    """
+    Rough token cost of a call: ~4 characters per prompt token plus the
+    expected completion size.
+    """
+    prompt_chars = sum(len(m.get("content") or "") for m in messages)
+    if completion_tokens is None:
+        completion_tokens = RATE_LIMIT_DEFAULT_COMPLETION_TOKENS
+    return prompt_chars // 4 + completion_tokens
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read Retry-After (or retry-after-ms) from a rate limit error's response headers.
+
+    Returns:
+        Seconds to wait, or None if the provider did not say
+    """
+    headers = getattr(error, "litellm_response_headers", None)
+    if headers is None:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(retry_at.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_bucket_levels() -> Dict[str, Dict[str, Any]]:
+    """Current bucket levels and queue depth for every deployment seen so far."""
+    return {name: limiter.snapshot() for name, limiter in _limiters.items()}
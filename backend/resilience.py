@@ -0,0 +1,180 @@
+"""Retry and request-hedging policies for council LLM calls.
+
+Transient provider failures are retried with exponential backoff and full
+jitter, so a burst of failures does not turn into a synchronized retry
+storm. Hedging targets stragglers: when a call runs past the member's
+recent p95 latency, a duplicate is fired and whichever answers first wins;
+the other is cancelled.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+import litellm
+
+from .circuit_breaker import CircuitOpenError
+from .config import (
+    LLM_RETRY_MAX_ATTEMPTS,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_SAMPLES,
+    LATENCY_WINDOW_SIZE,
+)
+
+# Errors worth another attempt: the same request may well succeed next time
+RETRYABLE_ERRORS = (
+    litellm.RateLimitError,
+    litellm.Timeout,
+    litellm.APIConnectionError,
+    litellm.InternalServerError,
+    litellm.ServiceUnavailableError,
+    asyncio.TimeoutError,
+    httpx.TransportError,
+)
+
+# Errors that will fail the same way every time (bad key, bad request, open circuit, ...)
+NON_RETRYABLE_ERRORS = (
+    CircuitOpenError,
+    litellm.AuthenticationError,
+    litellm.BadRequestError,
+    litellm.NotFoundError,
+    litellm.PermissionDeniedError,
+    ValueError,
+)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Classify an error from an LLM call as transient (retry) or permanent (fail now)."""
+    if isinstance(error, NON_RETRYABLE_ERRORS):
+        return False
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    # Unknown provider errors: retry on 5xx-style status codes only
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and status_code >= 500
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy(LLM_RETRY_MAX_ATTEMPTS, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per key."""
+
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE):
+        self.window_size = window_size
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float):
+        self._samples.setdefault(key, deque(maxlen=self.window_size)).append(seconds)
+
+    def count(self, key: str) -> int:
+        return len(self._samples.get(key, ()))
+
+    def percentile(self, key: str, pct: float) -> Optional[float]:
+        samples = self._samples.get(key)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+latency_tracker = LatencyTracker()
+
+_stats = {"retries": 0, "hedges_fired": 0, "hedges_won": 0}
+
+
+async def with_retries(
+    call: Callable[[], Awaitable[Any]],
+    label: str,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY
+) -> Any:
+    """
+    Run `call`, retrying retryable errors with jittered backoff.
+
+    Args:
+        call: Zero-argument factory returning a fresh awaitable per attempt
+        label: Name used in log lines
+        policy: Retry policy to apply
+
+    Returns:
+        The call's result; the last error is raised if every attempt fails
+    """
+    for attempt in range(1, policy.max_attempts + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == policy.max_attempts or not is_retryable(e):
+                raise
+            delay = policy.backoff(attempt)
+            _stats["retries"] += 1
+            print(f"[Retry] {label} attempt {attempt} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+async def with_hedging(call: Callable[[], Awaitable[Any]], key: str) -> Any:
+    """
+    Run `call`, firing a duplicate if it outlives the key's recent p95 latency.
+
+    Hedging only starts once LLM_HEDGE_MIN_SAMPLES latencies have been seen
+    for the key. The first successful attempt wins and the other is
+    cancelled; if both fail, the last error is raised.
+    """
+    start = time.monotonic()
+    threshold = None
+    if LLM_HEDGE_ENABLED and latency_tracker.count(key) >= LLM_HEDGE_MIN_SAMPLES:
+        threshold = latency_tracker.percentile(key, LLM_HEDGE_PERCENTILE)
+
+    if threshold is None:
+        result = await call()
+        latency_tracker.record(key, time.monotonic() - start)
+        return result
+
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=threshold)
+        if not done:
+            _stats["hedges_fired"] += 1
+            tasks.append(asyncio.ensure_future(call()))
+
+        pending = set(tasks)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not tasks[0]:
+                        _stats["hedges_won"] += 1
+                    latency_tracker.record(key, time.monotonic() - start)
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def get_resilience_stats() -> Dict[str, Any]:
+    """Retry and hedging counters."""
+    return dict(_stats)
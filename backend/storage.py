@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from .config import DATA_DIR
+from .usage import merge_summary, empty_totals, add_call
 
 # Try to import blob storage (may fail if azure-storage-blob not installed)
 try:
@@ -171,7 +172,8 @@ def add_assistant_message(
     conversation_id: str,
     stage1: List[Dict[str, Any]],
     stage2: List[Dict[str, Any]],
-    stage3: Dict[str, Any]
+    stage3: Dict[str, Any],
+    usage: Optional[Dict[str, Any]] = None
 ):
     """
     Add an assistant message with all 3 stages to a conversation.
@@ -181,32 +183,47 @@ def add_assistant_message(
         stage1: List of individual model responses
         stage2: List of model rankings
         stage3: Final synthesized response
+        usage: Per-stage usage summary of the run, added to the
+            conversation's running totals
     """
     conversation = get_conversation(conversation_id)
     if conversation is None:
         raise ValueError(f"Conversation {conversation_id} not found")
 
-    conversation["messages"].append({
+    message = {
         "role": "assistant",
         "stage1": stage1,
         "stage2": stage2,
         "stage3": stage3
-    })
+    }
+    if usage:
+        message["usage"] = usage
+        merge_summary(conversation.setdefault("usage", {}), usage)
+    conversation["messages"].append(message)
 
     save_conversation(conversation)
 
 
-def update_conversation_title(conversation_id: str, title: str):
+def update_conversation_title(
+    conversation_id: str,
+    title: str,
+    usage: Optional[Dict[str, Any]] = None
+):
     """
     Update the title of a conversation.
 
     Args:
         conversation_id: Conversation identifier
         title: New title for the conversation
+        usage: Usage record of the title call, added to the conversation's totals
     """
     conversation = get_conversation(conversation_id)
     if conversation is None:
         raise ValueError(f"Conversation {conversation_id} not found")
 
     conversation["title"] = title
+    if usage:
+        title_totals = empty_totals()
+        add_call(title_totals, usage)
+        merge_summary(conversation.setdefault("usage", {}), {"title": title_totals, "total": title_totals})
     save_conversation(conversation)
@@ -0,0 +1,154 @@
+"""Token usage and cost accounting for council LLM calls.
+
+Every call's prompt/completion tokens, latency and cost are attached to
+the stage result it produced. Totals are kept per stage (stage1, stage2,
+stage3, title) for each run, per conversation (stored with it) and
+globally since startup (/api/metrics).
+"""
+
+from typing import Dict, Any, List, Optional
+
+import litellm
+
+from .config import LLM_PRICE_PROMPT_PER_1K, LLM_PRICE_COMPLETION_PER_1K
+
+STAGES = ("stage1", "stage2", "stage3", "title")
+
+# Providers whose model names litellm cannot price (deployment names, the mock)
+_FLAT_RATE_PROVIDERS = ("azure", "mock")
+# litellm's prefix for providers whose name differs from ours
+_LITELLM_PREFIXES = {"google": "gemini"}
+
+
+def call_cost(provider: str, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost of one call: litellm's price list, else LLM_PRICE_*_PER_1K."""
+    if provider not in _FLAT_RATE_PROVIDERS:
+        prefix = _LITELLM_PREFIXES.get(provider, provider)
+        litellm_model = model if model.startswith(f"{prefix}/") else f"{prefix}/{model}"
+        try:
+            prompt_cost, completion_cost = litellm.cost_per_token(
+                model=litellm_model,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+            )
+            return prompt_cost + completion_cost
+        except Exception:
+            pass
+    return (prompt_tokens * LLM_PRICE_PROMPT_PER_1K + completion_tokens * LLM_PRICE_COMPLETION_PER_1K) / 1000
+
+
+def call_usage(
+    provider: str,
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    latency: float,
+    cached: bool = False
+) -> Dict[str, Any]:
+    """
+    Usage record for one call, as attached to stage results.
+
+    Cached responses cost nothing and report zero tokens.
+    """
+    if cached:
+        prompt_tokens = completion_tokens = 0
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "latency_seconds": round(latency, 3),
+        "cost_usd": round(call_cost(provider, model, prompt_tokens, completion_tokens), 6),
+        "cached": cached,
+    }
+
+
+def empty_totals() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "cached_calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "cost_usd": 0.0,
+        "latency_seconds": 0.0,
+    }
+
+
+def add_call(totals: Dict[str, Any], call: Optional[Dict[str, Any]]):
+    """Add one call's usage record to a totals dict."""
+    if not call:
+        return
+    totals["calls"] += 1
+    totals["cached_calls"] += 1 if call.get("cached") else 0
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        totals[key] += call.get(key, 0)
+    totals["cost_usd"] = round(totals["cost_usd"] + call.get("cost_usd", 0.0), 6)
+    totals["latency_seconds"] = round(totals["latency_seconds"] + call.get("latency_seconds", 0.0), 3)
+
+
+def merge_totals(totals: Dict[str, Any], other: Dict[str, Any]):
+    """Add one totals dict into another."""
+    for key in ("calls", "cached_calls", "prompt_tokens", "completion_tokens", "total_tokens"):
+        totals[key] += other.get(key, 0)
+    totals["cost_usd"] = round(totals["cost_usd"] + other.get("cost_usd", 0.0), 6)
+    totals["latency_seconds"] = round(totals["latency_seconds"] + other.get("latency_seconds", 0.0), 3)
+
+
+def summarize_run(
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    stage3_result: Dict[str, Any],
+    extra_calls: Optional[Dict[str, List[Dict[str, Any]]]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-stage and total usage of one council run, from its stage results.
+
+    extra_calls holds usage records of calls that produced no stage result
+    (e.g. stage 2 digests), by stage.
+
+    Returns:
+        {"stage1": totals, "stage2": totals, "stage3": totals, "total": totals}
+    """
+    summary = {"stage1": empty_totals(), "stage2": empty_totals(), "stage3": empty_totals()}
+    for result in stage1_results:
+        add_call(summary["stage1"], result.get("usage"))
+    for result in stage2_results:
+        add_call(summary["stage2"], result.get("usage"))
+    add_call(summary["stage3"], stage3_result.get("usage"))
+    # A speculative chairman draft that was refined is a second stage 3 call
+    add_call(summary["stage3"], (stage3_result.get("speculative") or {}).get("draft_usage"))
+    # As are the group summaries of a hierarchical synthesis
+    for call in (stage3_result.get("hierarchical") or {}).get("map_calls", []):
+        add_call(summary["stage3"], call)
+
+    for stage, calls in (extra_calls or {}).items():
+        for call in calls:
+            add_call(summary[stage], call)
+
+    summary["total"] = empty_totals()
+    for stage in ("stage1", "stage2", "stage3"):
+        merge_totals(summary["total"], summary[stage])
+    return summary
+
+
+def merge_summary(summary: Dict[str, Dict[str, Any]], other: Dict[str, Dict[str, Any]]):
+    """Accumulate a run (or title) summary into a running one, e.g. a conversation's."""
+    for stage, totals in other.items():
+        merge_totals(summary.setdefault(stage, empty_totals()), totals)
+
+
+_global: Dict[str, Dict[str, Any]] = {stage: empty_totals() for stage in STAGES}
+
+
+def record_call(stage: str, call: Optional[Dict[str, Any]]):
+    """Count a call in the process-wide totals."""
+    add_call(_global[stage], call)
+
+
+def get_usage_stats() -> Dict[str, Dict[str, Any]]:
+    """Process-wide usage per stage since startup, plus the overall total."""
+    stats = {stage: dict(totals) for stage, totals in _global.items()}
+    stats["total"] = empty_totals()
+    for totals in _global.values():
+        merge_totals(stats["total"], totals)
+    return stats
@@ -47,16 +47,36 @@ function App() {
       // Stream the council process (pass custom roles)
       await api.sendMessageStream(newConv.id, content, (eventType, event) => {
         switch (eventType) {
+          case 'stage1_member_complete':
+            // Render each perspective as soon as its member answers
+            responseData.stage1 = [...(responseData.stage1 || []), event.data];
+            setCurrentResponse({ ...responseData });
+            break;
+
           case 'stage1_complete':
             responseData.stage1 = event.data;
             setCurrentResponse({ ...responseData });
             break;
 
+          case 'stage2_member_complete':
+            responseData.stage2 = [...(responseData.stage2 || []), event.data];
+            setCurrentResponse({ ...responseData });
+            break;
+
           case 'stage2_complete':
             responseData.stage2 = event.data;
             setCurrentResponse({ ...responseData });
             break;
 
+          case 'stage3_delta':
+            // Chairman tokens as they arrive; replaced by stage3_complete
+            responseData.stage3 = {
+              model: responseData.stage3?.model || 'chairman',
+              response: (responseData.stage3?.response || '') + event.delta,
+            };
+            setCurrentResponse({ ...responseData });
+            break;
+
           case 'stage3_complete':
             responseData.stage3 = event.data;
             setCurrentResponse({ ...responseData });
@@ -16,6 +16,11 @@ export default function Stage3({ finalResponse }) {
         <div className="final-text markdown-content">
           <ReactMarkdown>{finalResponse.response}</ReactMarkdown>
         </div>
+        {finalResponse.truncated && (
+          <div className="truncated-notice">
+            This answer was cut off before the Chairman finished.
+          </div>
+        )}
       </div>
     </div>
   );
@@ -55,6 +55,15 @@ OPENROUTER_COUNCIL_MODELS = [
 ]
 OPENROUTER_CHAIRMAN_MODEL = "google/gemini-2.5-pro-preview"
 
+# ============================================================
+# HTTP CONNECTION POOLING
+# ============================================================
+# Shared clients are created at startup and reused across all council calls
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
 # ============================================================
 # COUNCIL CONFIGURATION (used by both backends)
 # ============================================================
@@ -0,0 +1,113 @@
+"""Shared, long-lived HTTP clients for the LLM backends.
+
+Creating an httpx.AsyncClient per call means a fresh TCP and TLS handshake
+for every council request. Instead, clients are created once (in the FastAPI
+lifespan hook), kept alive with a connection pool, and reused across all
+stages and requests. Connection counters make the reuse observable.
+"""
+
+from typing import Dict, Any
+import httpx
+
+from .config import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP2_ENABLED,
+)
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _new_stats() -> Dict[str, int]:
+    return {"requests": 0, "new_connections": 0, "tls_handshakes": 0}
+
+
+def _make_trace(stats: Dict[str, int]):
+    """Build an httpcore trace callback that counts new connections."""
+    async def trace(event_name: str, info: Dict[str, Any]):
+        if event_name == "connection.connect_tcp.complete":
+            stats["new_connections"] += 1
+        elif event_name == "connection.start_tls.complete":
+            stats["tls_handshakes"] += 1
+    return trace
+
+
+def _create_client(name: str) -> httpx.AsyncClient:
+    """Create a pooled client whose requests are traced into the stats for `name`."""
+    stats = _stats.setdefault(name, _new_stats())
+    trace = _make_trace(stats)
+
+    async def on_request(request: httpx.Request):
+        stats["requests"] += 1
+        request.extensions["trace"] = trace
+
+    http2 = HTTP2_ENABLED and H2_AVAILABLE
+    if HTTP2_ENABLED and not H2_AVAILABLE:
+        print("[HTTP] HTTP2_ENABLED is set but 'h2' is not installed; using HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(120.0),
+        event_hooks={"request": [on_request]},
+    )
+
+
+def get_client(name: str = "default") -> httpx.AsyncClient:
+    """
+    Get the shared client for a backend, creating it on first use.
+
+    Args:
+        name: Registry key, e.g. 'azure' or 'openrouter'
+
+    Returns:
+        A long-lived httpx.AsyncClient
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _create_client(name)
+        _clients[name] = client
+    return client
+
+
+async def startup():
+    """Create the shared clients."""
+    for name in ("azure", "openrouter"):
+        get_client(name)
+
+
+async def shutdown():
+    """Close every shared client."""
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+
+
+def get_connection_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Connection reuse counters per client.
+
+    Returns:
+        Dict mapping client name to requests, new_connections,
+        tls_handshakes and reused_connections
+    """
+    return {
+        name: {
+            **stats,
+            "reused_connections": max(stats["requests"] - stats["new_connections"], 0),
+        }
+        for name, stats in _stats.items()
+    }
@@ -22,6 +22,7 @@ from .config import (
     CHAIRMAN_SYSTEM_PROMPT,
     NURSING_SYSTEM_PROMPT,
 )
+from .http_clients import get_client
 
 
 async def query_azure_openai(
@@ -70,24 +71,24 @@ async def query_azure_openai(
     print(f"[Azure] Messages count: {len(full_messages)}")
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(url, headers=headers, json=payload)
+        client = get_client("azure")
+        response = await client.post(url, headers=headers, json=payload, timeout=timeout)
+        
+        print(f"[Azure] Response status: {response.status_code}")
+        
+        if response.status_code != 200:
+            print(f"[Azure] Error response: {response.text}")
+            return None
             
-            print(f"[Azure] Response status: {response.status_code}")
-            
-            if response.status_code != 200:
-                print(f"[Azure] Error response: {response.text}")
-                return None
-                
-            response.raise_for_status()
+        response.raise_for_status()
 
-            data = response.json()
-            message = data['choices'][0]['message']
+        data = response.json()
+        message = data['choices'][0]['message']
 
-            print(f"[Azure] Success! Response length: {len(message.get('content', ''))}")
-            return {
-                'content': message.get('content'),
-            }
+        print(f"[Azure] Success! Response length: {len(message.get('content', ''))}")
+        return {
+            'content': message.get('content'),
+        }
 
     except httpx.TimeoutException as e:
         print(f"[Azure] Timeout error for {deployment_name}: {e}")
@@ -137,21 +138,22 @@ async def query_openrouter(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                OPENROUTER_API_URL,
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            message = data['choices'][0]['message']
-
-            return {
-                'content': message.get('content'),
-                'reasoning_details': message.get('reasoning_details')
-            }
+        client = get_client("openrouter")
+        response = await client.post(
+            OPENROUTER_API_URL,
+            headers=headers,
+            json=payload,
+            timeout=timeout
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        message = data['choices'][0]['message']
+
+        return {
+            'content': message.get('content'),
+            'reasoning_details': message.get('reasoning_details')
+        }
 
     except Exception as e:
         print(f"Error querying model {model}: {e}")
@@ -1,6 +1,7 @@
 """FastAPI backend for LLM Council."""
 
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,9 +14,19 @@ import json
 import asyncio
 
 from . import storage
+from . import http_clients
 from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
 
-app = FastAPI(title="Nursing Council Agent API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared HTTP clients at startup and close them at shutdown."""
+    await http_clients.startup()
+    yield
+    await http_clients.shutdown()
+
+
+app = FastAPI(title="Nursing Council Agent API", lifespan=lifespan)
 
 # Enable CORS for local development, GitHub Codespaces, and Azure Container Apps
 app.add_middleware(
@@ -73,6 +84,12 @@ async def health_check():
     return {"status": "ok", "service": "Nursing Council Agent API"}
 
 
+@app.get("/api/metrics")
+async def metrics():
+    """Runtime metrics for the LLM backends."""
+    return {"http": http_clients.get_connection_stats()}
+
+
 @app.get("/api/conversations", response_model=List[ConversationMetadata])
 async def list_conversations():
     """List all conversations (metadata only)."""
@@ -0,0 +1,247 @@
+"""
+Tests for stage 2 labelling, planning and aggregation.
+
+These use small fixed inputs, so every expected average is worked out by hand.
+"""
+
+import json
+
+from backend.config import COUNCIL_MEMBERS, JUDGE_SYSTEM_PROMPT, STAGE2_MAX_RESPONSES_PER_PROMPT, STAGE2_SAMPLE_COVERAGE
+from backend.council import (
+    _relabel,
+    calculate_aggregate_rankings,
+    parse_ranking_json,
+    plan_rankings,
+    response_label,
+)
+
+LABELS = {"Response A": "academic", "Response B": "clinical_mentor", "Response C": "student_advocate"}
+
+
+def _stage1(models):
+    return [{"model": model, "response": f"Answer from {model}"} for model in models]
+
+
+def _ranking(parsed, candidates=None, scores=None):
+    result = {"model": "ranker", "ranking": "", "parsed_ranking": parsed}
+    if candidates is not None:
+        result["candidates"] = candidates
+    if scores is not None:
+        result["scores"] = scores
+    return result
+
+
+def _averages(aggregate):
+    return {entry["model"]: entry["average_rank"] for entry in aggregate}
+
+
+# response_label
+
+def test_response_label_single_letters():
+    assert response_label(0) == "A"
+    assert response_label(25) == "Z"
+
+
+def test_response_label_continues_past_z():
+    assert response_label(26) == "AA"
+    assert response_label(27) == "AB"
+    assert response_label(52) == "BA"
+    assert response_label(701) == "ZZ"
+    assert response_label(702) == "AAA"
+
+
+# parse_ranking_json
+
+def test_parse_ranking_json_reads_ranking_and_scores():
+    text = json.dumps({
+        "evaluations": [
+            {"label": "Response B", "score": 9, "comment": "Clear"},
+            {"label": "Response A", "score": 6, "comment": "Vague"},
+        ],
+        "ranking": ["Response B", "Response A"],
+    })
+    assert parse_ranking_json(text) == {
+        "ranking": ["Response B", "Response A"],
+        "scores": {
+            "Response B": {"score": 9, "comment": "Clear"},
+            "Response A": {"score": 6, "comment": "Vague"},
+        },
+    }
+
+
+def test_parse_ranking_json_accepts_bare_labels_and_fences():
+    text = '```json\n{"ranking": ["C", "A", "C", "B"]}\n```'
+    assert parse_ranking_json(text) == {"ranking": ["Response C", "Response A", "Response B"], "scores": {}}
+
+
+def test_parse_ranking_json_rejects_truncated_and_unusable_output():
+    assert parse_ranking_json('{"evaluations": [{"label": "Response A", "score": 8') is None
+    assert parse_ranking_json('{"ranking": []}') is None
+    assert parse_ranking_json('["Response A"]') is None
+    assert parse_ranking_json("FINAL RANKING:\n1. Response A") is None
+
+
+# _relabel
+
+def test_relabel_maps_all_labels_at_once():
+    labels = {"Response A": "Response B", "Response B": "Response C"}
+    assert _relabel("Response A beats Response B", labels) == "Response B beats Response C"
+
+
+def test_relabel_leaves_unknown_and_longer_labels_alone():
+    labels = {"Response A": "Response C"}
+    assert _relabel("Response Z and Response AB", labels) == "Response Z and Response AB"
+
+
+# plan_rankings
+
+def test_plan_rankings_full_review():
+    assignments, label_to_model = plan_rankings("q", _stage1(COUNCIL_MEMBERS), "json", self_exclusion=False)
+    assert label_to_model == LABELS
+    assert [a["ranker"] for a in assignments] == COUNCIL_MEMBERS
+    for assignment in assignments:
+        assert assignment["candidates"] is None
+        assert assignment["labels"] is None
+        assert assignment["responses"] == 3
+        assert assignment["system_prompt"] is None
+
+
+def test_plan_rankings_self_exclusion_maps_local_labels():
+    assignments, _ = plan_rankings("q", _stage1(COUNCIL_MEMBERS), "json", self_exclusion=True)
+    by_ranker = {a["ranker"]: a for a in assignments}
+    assert by_ranker["academic"]["candidates"] == ["Response B", "Response C"]
+    assert by_ranker["academic"]["labels"] == {"Response A": "Response B", "Response B": "Response C"}
+    assert by_ranker["clinical_mentor"]["labels"] == {"Response A": "Response A", "Response B": "Response C"}
+    assert by_ranker["student_advocate"]["labels"] == {"Response A": "Response A", "Response B": "Response B"}
+    for assignment in assignments:
+        assert assignment["responses"] == 2
+        assert f"Answer from {assignment['ranker']}" not in assignment["prompt"]
+
+
+def test_plan_rankings_self_exclusion_skips_rankers_left_with_one_response():
+    # academic and clinical_mentor would see one response each; student_advocate saw both
+    assignments, _ = plan_rankings("q", _stage1(["academic", "clinical_mentor"]), "json", self_exclusion=True)
+    assert [a["ranker"] for a in assignments] == ["student_advocate"]
+    assert assignments[0]["candidates"] is None
+
+
+def test_plan_rankings_judge_ranks_everything_once():
+    assignments, _ = plan_rankings("q", _stage1(COUNCIL_MEMBERS), "json", self_exclusion=True, judge="chairman")
+    assert len(assignments) == 1
+    assert assignments[0]["ranker"] == "chairman"
+    assert assignments[0]["candidates"] is None
+    assert assignments[0]["labels"] is None
+    assert assignments[0]["system_prompt"] == JUDGE_SYSTEM_PROMPT
+
+
+def test_judge_prompt_does_not_name_council_members():
+    for name in ["Academic", "Clinical Mentor", "Student Advocate"]:
+        assert name not in JUDGE_SYSTEM_PROMPT
+
+
+def test_plan_rankings_extra_rankers_use_judge_prompt():
+    assignments, _ = plan_rankings("q", _stage1(COUNCIL_MEMBERS), "json", self_exclusion=False, extra_rankers=["chairman"])
+    assert [a["ranker"] for a in assignments] == COUNCIL_MEMBERS + ["chairman"]
+    assert assignments[-1]["system_prompt"] == JUDGE_SYSTEM_PROMPT
+    assert all(a["system_prompt"] is None for a in assignments[:-1])
+
+
+def test_plan_rankings_skips_extra_rankers_already_on_council():
+    extra = [COUNCIL_MEMBERS[0], "chairman", "chairman"]
+    assignments, _ = plan_rankings("q", _stage1(COUNCIL_MEMBERS), "json", self_exclusion=False, extra_rankers=extra)
+    assert [a["ranker"] for a in assignments] == COUNCIL_MEMBERS + ["chairman"]
+    assert assignments[0]["system_prompt"] is None
+
+
+def test_plan_rankings_samples_large_councils():
+    count = STAGE2_MAX_RESPONSES_PER_PROMPT + 2
+    stage1 = _stage1([f"member_{i}" for i in range(count)])
+    assignments, label_to_model = plan_rankings("q", stage1, "json", self_exclusion=False)
+    assert len(label_to_model) == count
+
+    coverage = {label: 0 for label in label_to_model}
+    for assignment in assignments:
+        assert 2 <= assignment["responses"] <= STAGE2_MAX_RESPONSES_PER_PROMPT
+        assert len(assignment["candidates"]) == assignment["responses"]
+        for label in assignment["candidates"]:
+            coverage[label] += 1
+    assert set(coverage.values()) == {STAGE2_SAMPLE_COVERAGE}
+
+    # Seeded by the query, so a repeated question plans the same prompts
+    again, _ = plan_rankings("q", stage1, "json", self_exclusion=False)
+    assert [a["prompt"] for a in again] == [a["prompt"] for a in assignments]
+
+
+# calculate_aggregate_rankings
+
+def test_aggregate_averages_full_rankings():
+    results = [
+        _ranking(["Response A", "Response B", "Response C"]),
+        _ranking(["Response B", "Response A", "Response C"]),
+        _ranking(["Response A", "Response C", "Response B"]),
+    ]
+    aggregate = calculate_aggregate_rankings(results, LABELS)
+    assert aggregate == [
+        {"model": "academic", "average_rank": 1.33, "rankings_count": 3},
+        {"model": "clinical_mentor", "average_rank": 2.0, "rankings_count": 3},
+        {"model": "student_advocate", "average_rank": 2.67, "rankings_count": 3},
+    ]
+
+
+def test_aggregate_stretches_partial_rankings_onto_full_scale():
+    # Two of three candidates: positions 1 and 2 become 1 and 3
+    results = [_ranking(["Response B", "Response A"], candidates=["Response A", "Response B"])]
+    assert _averages(calculate_aggregate_rankings(results, LABELS)) == {"clinical_mentor": 1.0, "academic": 3.0}
+
+
+def test_aggregate_unranked_candidates_share_remaining_positions():
+    # A takes position 1; B and C split positions 2 and 3
+    results = [_ranking(["Response A"])]
+    aggregate = calculate_aggregate_rankings(results, LABELS)
+    assert _averages(aggregate) == {"academic": 1.0, "clinical_mentor": 2.5, "student_advocate": 2.5}
+    assert all(entry["rankings_count"] == 1 for entry in aggregate)
+
+
+def test_aggregate_combines_self_excluded_rankings():
+    # Each ranker saw the other two, already mapped back to the run's labels
+    results = [
+        _ranking(["Response C", "Response B"], candidates=["Response B", "Response C"]),
+        _ranking(["Response A", "Response C"], candidates=["Response A", "Response C"]),
+        _ranking(["Response A", "Response B"], candidates=["Response A", "Response B"]),
+    ]
+    aggregate = calculate_aggregate_rankings(results, LABELS)
+    assert aggregate == [
+        {"model": "academic", "average_rank": 1.0, "rankings_count": 2},
+        {"model": "student_advocate", "average_rank": 2.0, "rankings_count": 2},
+        {"model": "clinical_mentor", "average_rank": 3.0, "rankings_count": 2},
+    ]
+
+
+def test_aggregate_skips_empty_and_unknown_rankings():
+    results = [
+        _ranking(["Response B", "Response A", "Response C"]),
+        _ranking([]),
+        _ranking(["Response Z"]),
+    ]
+    aggregate = calculate_aggregate_rankings(results, LABELS)
+    assert _averages(aggregate) == {"clinical_mentor": 1.0, "academic": 2.0, "student_advocate": 3.0}
+    assert all(entry["rankings_count"] == 1 for entry in aggregate)
+
+
+def test_aggregate_averages_json_scores():
+    results = [
+        _ranking(["Response A", "Response B"], scores={
+            "Response A": {"score": 9, "comment": ""},
+            "Response B": {"score": 6, "comment": ""},
+        }),
+        _ranking(["Response A", "Response B"], scores={
+            "Response A": {"score": 8, "comment": ""},
+            "Response B": {"score": None, "comment": ""},
+        }),
+    ]
+    labels = {"Response A": "academic", "Response B": "clinical_mentor"}
+    aggregate = calculate_aggregate_rankings(results, labels)
+    assert aggregate == [
+        {"model": "academic", "average_rank": 1.0, "rankings_count": 2, "average_score": 8.5},
+        {"model": "clinical_mentor", "average_rank": 2.0, "rankings_count": 2, "average_score": 6.0},
+    ]
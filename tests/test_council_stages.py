@@ -0,0 +1,85 @@
+"""
+Tests for stage scheduling: a stage's timeout bounds the whole stage, even
+when its calls queue behind COUNCIL_MAX_CONCURRENCY.
+"""
+
+import asyncio
+import time
+
+from backend import council
+from backend.config import COUNCIL_MAX_CONCURRENCY
+
+CALL_SECONDS = 0.4
+# Room for two waves of calls, not three
+STAGE_SECONDS = 2.5 * CALL_SECONDS
+
+
+async def _slow_model(member_id, messages, llm_config=None, timeout=120.0, params=None, system_prompt=None):
+    try:
+        await asyncio.wait_for(asyncio.sleep(CALL_SECONDS), timeout)
+    except asyncio.TimeoutError:
+        return None
+    return {"content": f"Answer from {member_id}", "backend": "mock", "usage": None}
+
+
+def _large_council(monkeypatch, size):
+    members = [f"member_{i}" for i in range(size)]
+    monkeypatch.setattr(council, "get_council_members", lambda: members)
+    monkeypatch.setattr(council, "query_model", _slow_model)
+    return members
+
+
+def test_stage1_timeout_covers_queued_calls(monkeypatch):
+    _large_council(monkeypatch, 2 * COUNCIL_MAX_CONCURRENCY + 1)
+    started_at = time.monotonic()
+    results = asyncio.run(council.stage1_collect_responses("q", timeout=STAGE_SECONDS))
+    elapsed = time.monotonic() - started_at
+
+    assert elapsed < STAGE_SECONDS + CALL_SECONDS / 4
+    assert len(results) == 2 * COUNCIL_MAX_CONCURRENCY
+
+
+def test_stage2_timeout_covers_queued_calls(monkeypatch):
+    members = _large_council(monkeypatch, 2 * COUNCIL_MAX_CONCURRENCY + 1)
+    stage1 = [{"model": member, "response": f"Answer from {member}"} for member in members[:3]]
+    assignments, _ = council.plan_rankings("q", stage1, "json", self_exclusion=False)
+
+    async def collect():
+        return [result async for _, result in council.stage2_iter_rankings(assignments, timeout=STAGE_SECONDS)]
+
+    started_at = time.monotonic()
+    results = asyncio.run(collect())
+    elapsed = time.monotonic() - started_at
+
+    assert elapsed < STAGE_SECONDS + CALL_SECONDS / 4
+    assert len(results) == 2 * COUNCIL_MAX_CONCURRENCY
+
+
+def test_unused_chairman_draft_is_cancelled_when_stage2_fails(monkeypatch):
+    _large_council(monkeypatch, 3)
+    monkeypatch.setattr(council, "CHAIRMAN_SPECULATIVE", True)
+    drafts = []
+    start_draft = council.start_chairman_draft
+
+    def start_chairman_draft(*args, **kwargs):
+        drafts.append(start_draft(*args, **kwargs))
+        return drafts[-1]
+
+    async def failing_stage2(*args, **kwargs):
+        raise RuntimeError("stage 2 failed")
+
+    monkeypatch.setattr(council, "start_chairman_draft", start_chairman_draft)
+    monkeypatch.setattr(council, "stage2_collect_rankings", failing_stage2)
+
+    async def run():
+        try:
+            await council.run_full_council("q", deadline_seconds=10.0)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("stage 2 failure should propagate")
+        # Checked before asyncio.run cancels whatever is left at shutdown
+        await asyncio.sleep(0.01)
+        return drafts[0].cancelled()
+
+    assert asyncio.run(run())
@@ -0,0 +1,46 @@
+"""
+Tests for the disk tier of the response cache: its size cap is enforced
+from an in-memory index, without rescanning the directory on every write.
+"""
+
+import os
+
+from backend import llm_cache
+
+ENTRY_CHARS = 300 * 1024
+
+
+def _fresh_disk_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_DISK_MAX_MB", 1)
+    monkeypatch.setattr(llm_cache, "_disk_index", None)
+    monkeypatch.setattr(llm_cache, "_disk_bytes", 0)
+    scans = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        scans.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(llm_cache.os, "scandir", scandir)
+    return scans
+
+
+def test_disk_cache_evicts_oldest_entries_past_size_cap(monkeypatch, tmp_path):
+    scans = _fresh_disk_cache(monkeypatch, tmp_path)
+    for key in ["a", "b", "c", "d", "e"]:
+        llm_cache._write_disk(key, key * ENTRY_CHARS)
+
+    # Three ~300KB entries fit under 1MB; the two oldest are gone
+    assert sorted(os.listdir(tmp_path)) == ["c.json", "d.json", "e.json"]
+    assert llm_cache._disk_bytes == sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+    assert len(scans) == 1
+
+
+def test_disk_cache_rewrite_does_not_double_count(monkeypatch, tmp_path):
+    _fresh_disk_cache(monkeypatch, tmp_path)
+    for _ in range(5):
+        llm_cache._write_disk("same", "x" * ENTRY_CHARS)
+
+    assert os.listdir(tmp_path) == ["same.json"]
+    assert llm_cache._disk_bytes == os.path.getsize(tmp_path / "same.json")
@@ -0,0 +1,151 @@
+"""
+Tests for the call path in llm_client: circuit breaker bookkeeping around
+the rate limiter queue, what happens to calls a stage leaves behind, and
+which responses are cached.
+"""
+
+import asyncio
+import time
+
+from backend import llm_client
+from backend.circuit_breaker import HALF_OPEN, OPEN, CircuitBreaker
+from backend.config import CIRCUIT_OPEN_SECONDS
+
+
+class _StuckLimiter:
+    """A limiter whose queue never moves."""
+
+    name = "stuck"
+
+    async def acquire(self, tokens: int = 0):
+        await asyncio.sleep(3600)
+
+
+def _half_open_route(monkeypatch):
+    breaker = CircuitBreaker("test/stuck")
+    breaker.state = OPEN
+    breaker.opened_at = time.monotonic() - CIRCUIT_OPEN_SECONDS - 1
+    route = {
+        "target": None,
+        "model": "stuck",
+        "api_key": "",
+        "api_base": None,
+        "api_version": None,
+        "limiter": _StuckLimiter(),
+        "breaker": breaker,
+    }
+    monkeypatch.setattr(llm_client, "_route", lambda *args: route)
+    return breaker
+
+
+def _assert_probe_released(breaker):
+    assert breaker.state == HALF_OPEN
+    assert not breaker.probe_in_flight
+    assert breaker.allow()
+
+
+def test_call_cancelled_in_limiter_queue_releases_probe(monkeypatch):
+    breaker = _half_open_route(monkeypatch)
+    messages = [{"role": "user", "content": "hi"}]
+
+    async def run():
+        call = llm_client._rate_limited_call(messages, "openai", "stuck", "", "academic", time.monotonic() + 60)
+        try:
+            await asyncio.wait_for(call, 0.05)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("call should have timed out in the queue")
+
+    asyncio.run(run())
+    _assert_probe_released(breaker)
+
+
+def test_stream_timed_out_in_limiter_queue_releases_probe(monkeypatch):
+    breaker = _half_open_route(monkeypatch)
+    messages = [{"role": "user", "content": "hi"}]
+
+    async def run():
+        now = time.monotonic()
+        stream = llm_client._stream_on(messages, "openai", "stuck", "", "chairman", now + 60, now + 0.05, {})
+        try:
+            await stream.__anext__()
+        except asyncio.TimeoutError:
+            pass
+        else:
+            raise AssertionError("stream should have timed out in the queue")
+
+    asyncio.run(run())
+    _assert_probe_released(breaker)
+
+
+async def _answer(value, delay):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_iter_as_completed_records_stragglers_after_quorum():
+    late = []
+
+    async def run():
+        calls = [_answer("fast", 0), _answer("slow", 0.05)]
+        seen = [i async for i, _ in llm_client.iter_as_completed(calls, quorum=1, on_late=lambda i, r: late.append(r))]
+        await asyncio.sleep(0.1)
+        return seen
+
+    assert asyncio.run(run()) == [0]
+    assert late == ["slow"]
+
+
+def test_iter_as_completed_cancels_stragglers_when_consumer_stops():
+    late = []
+
+    async def run():
+        calls = [_answer("fast", 0), _answer("slow", 0.05)]
+        results = llm_client.iter_as_completed(calls, on_late=lambda i, r: late.append(r))
+        async for _ in results:
+            break
+        await results.aclose()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert late == []
+
+
+def _fake_provider(monkeypatch, content, finish_reason):
+    calls = []
+
+    async def agenerate_response(messages, provider, model, api_key, **kwargs):
+        calls.append(messages)
+        return {"content": content, "finish_reason": finish_reason, "prompt_tokens": 10, "completion_tokens": 5}
+
+    monkeypatch.setattr(llm_client.LLMService, "agenerate_response", agenerate_response)
+    return calls
+
+
+def _generate_twice(question, params=None):
+    messages = [{"role": "user", "content": question}]
+
+    async def run():
+        for _ in range(2):
+            await llm_client._generate(messages, "openai", "gpt-4o", "sk-test", "academic", 5.0, params=params)
+
+    asyncio.run(run())
+
+
+def test_complete_response_is_cached(monkeypatch):
+    calls = _fake_provider(monkeypatch, '{"ranking": ["Response A"]}', "stop")
+    _generate_twice("cached?", {"response_format": {"type": "json_object"}})
+    assert len(calls) == 1
+
+
+def test_response_cut_off_by_max_tokens_is_not_cached(monkeypatch):
+    calls = _fake_provider(monkeypatch, "The answer is", "length")
+    _generate_twice("cut off?")
+    assert len(calls) == 2
+
+
+def test_invalid_json_mode_response_is_not_cached(monkeypatch):
+    calls = _fake_provider(monkeypatch, '{"evaluations": [{"label": "Response A"', "stop")
+    _generate_twice("invalid json?", {"response_format": {"type": "json_object"}})
+    assert len(calls) == 2